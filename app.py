@@ -1,105 +1,137 @@
 # app.py — Final + Auto Backup Dataset Lama + Fix Login Siswa + Full Data Siswa
 import streamlit as st
-from views import dashboard, data_siswa, data_guru, rapor, statistik, prediksi
+from views import dashboard, data_siswa, data_guru, rapor, statistik, prediksi, performa
 import pandas as pd
-import sqlite3
-import os
-from datetime import datetime
+
+# Copy-on-write untuk seluruh proses: frame dataset bersama dibagikan ke sesi sebagai
+# salinan dangkal (utils/dataset_store.py); kolom hanya disalin saat diubah
+pd.set_option("mode.copy_on_write", True)
 
 from login import show as login_show, logout
+from utils import dataset_store, assets, snapshot, dtypes, ingest, schema
 
-DB_FILE = "database.db"
-BACKUP_DIR = "backup"
+DB_FILE = dataset_store.DB_FILE
+BACKUP_DIR = snapshot.SNAPSHOT_DIR
 
 # =========================
 # Util dataset
 # =========================
 def normalize_dataset(df: pd.DataFrame) -> pd.DataFrame:
-    """Samakan nama kolom supaya konsisten"""
+    """Samakan nama kolom supaya konsisten (peran kolom: utils/schema.py)"""
     df.columns = [c.strip().title() for c in df.columns]
-
-    if "Nis" in df.columns:
-        df = df.rename(columns={"Nis": "NIS"})
-    if "Nisn" in df.columns:
-        df = df.rename(columns={"Nisn": "NISN"})
+    df = df.rename(columns=schema.NAMA_TAMPIL)
     if "Nama Siswa" in df.columns and "Nama" not in df.columns:
         df = df.rename(columns={"Nama Siswa": "Nama"})
-    if "Mtk" in df.columns:
-        df = df.rename(columns={"Mtk": "MTK"})
-    if "B.Indonesia" in df.columns:
-        df = df.rename(columns={"B.Indonesia": "Indo"})
-    if "B.Inggris" in df.columns:
-        df = df.rename(columns={"B.Inggris": "Inggris"})
-    if "Ppkn" in df.columns:
-        df = df.rename(columns={"Ppkn": "PPKN"})
     return df
 
-def save_dataset_to_db(df: pd.DataFrame):
-    conn = sqlite3.connect(DB_FILE)
-    df.to_sql("siswa", conn, if_exists="replace", index=False)
-    conn.close()
+def save_dataset_to_db(df: pd.DataFrame, source_hash=None, roles=None):
+    # Simpan (Parquet) + skema kolom, naikkan versi dataset → cache pembaca otomatis kadaluarsa
+    return dataset_store.save_dataset(df, source_hash, roles)
 
 def load_dataset_from_db():
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        df = pd.read_sql("SELECT * FROM siswa", conn)
-        conn.close()
-        return df
-    except Exception:
-        return None
+    # Dari cache per versi; DB hanya dibaca ulang jika dataset berubah
+    return dataset_store.load_dataset()
 
 def backup_dataset():
-    """Backup dataset lama sebelum diganti"""
+    """Backup dataset lama sebelum diganti (snapshot Parquet, dedup per isi)"""
     df_old = load_dataset_from_db()
     if df_old is not None:
-        os.makedirs(BACKUP_DIR, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = os.path.join(BACKUP_DIR, f"siswa_backup_{timestamp}.csv")
-        df_old.to_csv(backup_file, index=False)
-        st.info(f"📦 Dataset lama di-backup: {backup_file}")
+        h, baru = snapshot.create_snapshot(df_old)
+        if baru:
+            st.info(f"📦 Dataset lama di-backup: snapshot {h}")
+        else:
+            st.caption(f"📦 Snapshot {h} sudah ada, tidak disimpan ulang.")
+
+def restore_menu():
+    """Pulihkan dataset dari snapshot"""
+    snaps = snapshot.list_snapshots()
+    if not snaps:
+        return
+    with st.expander("🗂️ Pulihkan Snapshot"):
+        label = {s["hash"]: f'{s["created"]} · {s["rows"]} baris' for s in snaps}
+        pilih = st.selectbox("Snapshot", list(label), format_func=label.get)
+        if st.button("♻️ Pulihkan"):
+            st.session_state["dataset_version"] = snapshot.restore_snapshot(pilih)
+            st.session_state["dataset"] = load_dataset_from_db()
+            st.session_state.pop("upload_hash", None)
+            data_siswa.sync_from_dataset()
+            st.success(f"✅ Snapshot {pilih} dipulihkan")
 
 # =========================
 # Sidebar untuk Admin/Guru
 # =========================
 def sidebar_menu_admin():
     with st.sidebar:
-        st.image("assets/img/logo.png", use_container_width=True)
+        assets.image("logo.png")
         st.markdown("### 📂 Dataset")
         uploaded_file = st.file_uploader("Upload file CSV/XLSX", type=["csv","xls","xlsx"])
 
         # Hapus dataset lama saat tidak ada file
         if uploaded_file is None and "dataset" in st.session_state:
             del st.session_state["dataset"]
+            st.session_state.pop("dataset_version", None)
 
-        # Proses upload file
+        # Proses upload file (sekali per isi file, bukan per rerun)
         if uploaded_file is not None:
-            try:
-                raw = pd.read_csv(uploaded_file) if uploaded_file.name.endswith(".csv") else pd.read_excel(uploaded_file)
-                df = normalize_dataset(raw)
-
-                # Backup dataset lama
-                backup_dataset()
-
-                # Simpan dataset baru
-                st.session_state["dataset"] = df.copy()
-                save_dataset_to_db(df)
-                st.success("✅ Dataset berhasil diunggah dan tersimpan ke DB")
-            except Exception as e:
-                st.error(f"❌ Gagal memproses file: {e}")
+            file_hash = ingest.file_hash(uploaded_file)
+            if st.session_state.get("upload_hash") == file_hash and "dataset" in st.session_state:
+                pass  # rerun biasa: file yang sama sudah diproses sesi ini
+            elif dataset_store.get_source_hash() == file_hash:
+                # File sama sudah tersimpan (mis. dari sesi lain) → cukup ambil dari cache
+                db_df = load_dataset_from_db()
+                if db_df is not None:
+                    st.session_state["dataset"] = db_df
+                    st.session_state["dataset_version"] = dataset_store.get_version()
+                    st.session_state["upload_hash"] = file_hash
+            else:
+                try:
+                    # Dibaca per potongan (CSV chunk / XLSX read_only, semua sheet);
+                    # normalisasi + pemadatan tipe per potongan
+                    bar = st.progress(0.0, text="📥 Membaca file...")
+                    df, info = ingest.ingest(
+                        uploaded_file, normalize_dataset,
+                        progress=lambda fraksi, teks: bar.progress(fraksi, text=teks)
+                    )
+                    bar.empty()
+                    mem_awal, mem_akhir = info["raw_bytes"], info["bytes"]
+
+                    # Backup dataset lama
+                    backup_dataset()
+
+                    # Simpan dataset baru; sesi memakai frame bersama dari store
+                    st.session_state["dataset_version"] = save_dataset_to_db(df, file_hash, info["schema"])
+                    st.session_state["dataset"] = load_dataset_from_db()
+                    st.session_state["upload_hash"] = file_hash
+                    # Perbarui siswa_master (insert/update/delete sekali jalan)
+                    data_siswa.sync_from_dataset()
+                    st.success(f"✅ Dataset berhasil diunggah dan tersimpan ke DB ({info['rows']:,} baris)")
+                    if len(info["sheets"]) > 1:
+                        st.caption(f"📑 {len(info['sheets'])} sheet digabung: {', '.join(map(str, info['sheets']))}")
+                    if info["empty_rows"]:
+                        st.caption(f"🧹 {info['empty_rows']:,} baris kosong dilewati")
+                    st.caption(f"💾 Memori dataset: {dtypes.format_bytes(mem_awal)} → {dtypes.format_bytes(mem_akhir)}")
+                    with st.expander(f"🧭 Skema kolom ({len(info['schema'].mapel)} mapel)"):
+                        st.dataframe(info["schema"].frame(), use_container_width=True, hide_index=True)
+                except Exception as e:
+                    st.error(f"❌ Gagal memproses file: {e}")
         else:
             # Load dataset dari DB jika session_state belum ada
             if "dataset" not in st.session_state:
                 db_df = load_dataset_from_db()
                 if db_df is not None:
                     st.session_state["dataset"] = db_df
+                    st.session_state["dataset_version"] = dataset_store.get_version()
             if "dataset" not in st.session_state:
                 st.info("Belum ada file diunggah.")
+            restore_menu()
 
         st.markdown("---")
         menu = [
             "🏠 Dashboard","👨‍🎓 Data Siswa","👨‍🏫 Data Guru",
             "📑 Rapor","📊 Statistik","🤖 Prediksi Kelulusan","🚪 Logout"
         ]
+        if st.session_state.get("role") == "Admin":
+            menu.insert(-1, "⏱️ Performa")
         return st.radio("Navigasi", menu, label_visibility="collapsed")
 
 # =========================
@@ -107,7 +139,7 @@ def sidebar_menu_admin():
 # =========================
 def sidebar_menu_siswa():
     with st.sidebar:
-        st.image("assets/img/logo.png", use_container_width=True)
+        assets.image("logo.png")
         menu = ["🤖 Prediksi Kelulusan","🚪 Logout"]
         return st.radio("Navigasi", menu, label_visibility="collapsed")
 
@@ -127,18 +159,12 @@ def main():
     if role == "Siswa":
         choice = sidebar_menu_siswa()
         if choice == "🤖 Prediksi Kelulusan":
-            df = load_dataset_from_db()
-            if df is not None:
-                st.session_state["dataset"] = df
-                nama = st.session_state.get("nama", "").strip()
-                nis = str(st.session_state.get("nis", "")).strip()
-
-                # Pastikan Nama & NIS cocok (case-insensitive)
-                df_siswa = df[
-                    (df["Nama"].astype(str).str.strip().str.lower() == nama.lower()) &
-                    (df["NIS"].astype(str).str.strip() == nis)
-                ]
+            nama = st.session_state.get("nama", "").strip()
+            nis = str(st.session_state.get("nis", "")).strip()
 
+            # Pastikan Nama & NIS cocok (case-insensitive) → satu query ber-index
+            df_siswa = dataset_store.get_siswa(nis, nama)
+            if df_siswa is not None:
                 if not df_siswa.empty:
                     st.subheader("📊 Nilai & Hasil Prediksi Anda")
                     st.dataframe(df_siswa, use_container_width=True)
@@ -154,6 +180,7 @@ def main():
                 st.warning("⚠️ Dataset belum tersedia, silakan hubungi Admin/Guru.")
         elif choice == "🚪 Logout":
             if "dataset" in st.session_state: del st.session_state["dataset"]
+            st.session_state.pop("dataset_version", None)
             logout()
 
     # ================= Admin / Guru =================
@@ -175,8 +202,11 @@ def main():
                 prediksi.show()
             else:
                 st.warning("⚠️ Dataset belum tersedia, silakan unggah terlebih dahulu.")
+        elif choice == "⏱️ Performa" and role == "Admin":
+            performa.show()
         elif choice == "🚪 Logout":
             if "dataset" in st.session_state: del st.session_state["dataset"]
+            st.session_state.pop("dataset_version", None)
             logout()
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+# benchmarks/generator.py
+# ==========================================================
+# Generator data sekolah sintetis untuk benchmark
+# Skema "nilai" = data/contoh_nilai.csv, skema "siswa" = data/siswa.csv (+ IPA, IPS)
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+JURUSAN = ["TKJ", "AKL", "TO", "TBSM"]
+TINGKAT = ["X", "XI", "XII"]
+NAMA_DEPAN = ["AHMAD", "AISYAH", "BUDI", "DEWI", "EKA", "FAJAR", "GALIH", "HESTY",
+              "INDAH", "JULIA", "LATIF", "NAELA", "PUTRA", "RAHMA", "RISA", "TEGUH"]
+NAMA_BELAKANG = ["SAPUTRA", "RAHAYU", "SETIAWAN", "LESTARI", "PRATAMA", "NINGRUM",
+                 "HIDAYAT", "WIJAYA", "FAUZI", "ALIZZA", "ARTAWIJAYA", "SETIANINGSIH"]
+EKSTRA = np.array(["B", "SB", "C", ""], dtype=object)
+
+MAPEL_NILAI = ["PAPB", "PANCASILA", "B.INDO", "B.JAWA", "SEJARAH", "PJOK", "PKK",
+               "B.ING", "MTK", "TKJ", "GRAFIS"]
+# + IPA & IPS: bersama MTK, B.INDO (→ BINDO) dan B.ING (→ BINGGRIS) membentuk kelima
+# mapel prediksi (views/prediksi.MAPEL_COLS) → benchmark scoring/training memakai 5 fitur
+MAPEL_SISWA = ["PAPB", "PANCASILA", "B.INDO", "B.JAWA", "SEJARAH", "PJOK", "B.ING",
+               "MTK", "IPAS", "IPA", "IPS", "INFORMATIKA", "DASAR TKJ", "SENI"]
+
+def _nilai(rng, n, k):
+    # Nilai rapor: sekitar 78 ± 6, dibulatkan, 50..100
+    return np.clip(np.rint(rng.normal(78, 6, (n, k))), 50, 100)
+
+def _kelas(rng, n):
+    jur = rng.choice(JURUSAN, n)
+    kelas = pd.Series(rng.choice(TINGKAT, n)) + " " + jur + " " + pd.Series(rng.integers(1, 4, n)).astype(str)
+    return kelas.to_numpy(), jur
+
+def _nama(rng, n):
+    depan = rng.choice(NAMA_DEPAN, n)
+    belakang = rng.choice(NAMA_BELAKANG, n)
+    return pd.Series(depan) + " " + pd.Series(belakang)
+
+def _absen(rng, n):
+    sakit = rng.poisson(1.0, n)
+    izin = rng.poisson(0.8, n)
+    # ± 5% siswa alpa berat (> 5) → memicu override di prediksi
+    alpa = np.where(rng.random(n) < 0.05, rng.integers(6, 15, n), rng.poisson(0.7, n))
+    return sakit, izin, alpa
+
+def generate(n, schema="nilai", seed=42) -> pd.DataFrame:
+    """Dataset n baris dengan skema 'nilai' (contoh_nilai.csv) atau 'siswa' (siswa.csv)."""
+    rng = np.random.default_rng(seed)
+    nis = np.arange(1000, 1000 + n)
+    nama = _nama(rng, n)
+    kelas, jur = _kelas(rng, n)
+    sakit, izin, alpa = _absen(rng, n)
+    ekstra = EKSTRA[rng.choice(len(EKSTRA), n, p=[0.55, 0.25, 0.1, 0.1])]
+
+    if schema == "nilai":
+        nilai = _nilai(rng, n, len(MAPEL_NILAI)).astype(int)
+        df = pd.DataFrame({
+            "NO": np.arange(1, n + 1),
+            "NAMA": nama,
+            "NISN": pd.Series(rng.integers(10**8, 10**9, n)).astype(str).str.zfill(10),
+            "NIS": nis,
+            "KELAS": kelas,
+        })
+        df[MAPEL_NILAI] = nilai
+        df["TOTAL"] = nilai.sum(axis=1)
+        df["SAKIT"], df["IZIN"], df["ALPA"] = sakit, izin, alpa
+        df["EKSTRA"] = ekstra
+        return df
+
+    if schema == "siswa":
+        df = pd.DataFrame({
+            "NIS": nis.astype(float),
+            "Nama": nama,
+            "Kelas": kelas,
+            "Jurusan": jur,
+            "NO": np.arange(1, n + 1, dtype=float),
+        })
+        df[MAPEL_SISWA] = _nilai(rng, n, len(MAPEL_SISWA))
+        df["Sakit"], df["Izin"], df["Alpa"] = sakit.astype(float), izin.astype(float), alpa.astype(float)
+        df["EKSTRA"] = ekstra
+        return df
+
+    raise ValueError(f"Skema tidak dikenal: {schema}")
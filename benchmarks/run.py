@@ -0,0 +1,220 @@
+# benchmarks/run.py
+# ==========================================================
+# Benchmark jalur utama aplikasi dengan data sintetis
+#
+#   python -m benchmarks.run                       # 1k, 10k, 100k baris
+#   python -m benchmarks.run --sizes 1000 1000000  # termasuk 1M baris
+#   python -m benchmarks.run --compare bench_lama.json
+#
+# Hasil ditulis ke JSON (default: bench_results.json) berisi metadata
+# versi + waktu min/median per langkah, supaya bisa dibandingkan antar versi.
+# ==========================================================
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.generator import generate  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+# =========================
+# Util timing
+# =========================
+def _timeit(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+def _record(results, name, rows, fn, repeat, setup=None):
+    if setup:
+        setup()
+    times = _timeit(fn, repeat)
+    r = {
+        "name": name,
+        "rows": rows,
+        "repeat": repeat,
+        "min_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+    }
+    results.append(r)
+    print(f"  {name:<28} {rows:>9,} baris  min {r['min_s']:.4f}s  median {r['median_s']:.4f}s")
+
+def _skip(results, name, rows, alasan):
+    results.append({"name": name, "rows": rows, "skipped": alasan})
+    print(f"  {name:<28} {rows:>9,} baris  dilewati ({alasan})")
+
+def _meta():
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        commit = None
+    import sklearn
+    import fpdf
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "fpdf2": fpdf.__version__,
+    }
+
+# =========================
+# Benchmark per ukuran
+# =========================
+def bench_size(n, args, results):
+    import app
+    from utils import helpers, dataset_store, connection, dtypes, schema
+    from utils.scoring import score_df
+    from utils.training import bisa_dilatih, train_evaluate, cross_validate
+    from views import prediksi, rapor, data_siswa
+
+    repeat = args.repeat if n < 100_000 else 1
+    df_nilai = generate(n, "nilai", seed=args.seed)
+    df_siswa = generate(n, "siswa", seed=args.seed)
+    print(f"\n== {n:,} baris ==")
+
+    # Normalisasi kolom
+    _record(results, "app.normalize_dataset", n, lambda: app.normalize_dataset(df_nilai.copy()), repeat)
+    _record(results, "helpers.normalize_df", n, lambda: helpers.normalize_df(df_nilai), repeat)
+    _record(results, "schema.resolve", n, lambda: schema.resolve_df(df_siswa), repeat)
+
+    # Scoring + training (jalur views/prediksi.show tanpa UI)
+    roles = schema.resolve_df(df_siswa)
+    nilai_cols = [c for c in map(roles.col, prediksi.MAPEL_COLS) if c in df_siswa.columns]
+    scored = score_df(df_siswa, nilai_cols, 75)
+    _record(results, "prediksi.score", n, lambda: score_df(df_siswa, nilai_cols, 75), repeat)
+    if n > args.train_max_rows:
+        _skip(results, "prediksi.train_evaluate", n, f"> --train-max-rows {args.train_max_rows}")
+        _skip(results, "prediksi.cross_validate", n, f"> --train-max-rows {args.train_max_rows}")
+    elif bisa_dilatih(scored["Target"]):
+        X, y = scored[nilai_cols], scored["Target"]
+        _record(results, "prediksi.train_evaluate", n, lambda: train_evaluate(X, y), repeat)
+        _record(results, "prediksi.cross_validate", n, lambda: cross_validate(X, y), repeat)
+
+    # PDF
+    if n > args.pdf_max_rows:
+        _skip(results, "prediksi.generate_pdf", n, f"> --pdf-max-rows {args.pdf_max_rows}")
+        _skip(results, "rapor.generate_pdf", n, f"> --pdf-max-rows {args.pdf_max_rows}")
+    else:
+        cols = ["NIS", "Nama", "Rata-rata_Final", "Bonus_Ekstra", "Keterangan"]
+        lulus = scored[scored["Target"] == 1][cols]
+        tidak = scored[scored["Target"] == 0][cols]
+        eval_df = pd.DataFrame({"Metrik": ["Accuracy"], "Skor": [1.0]})
+        _record(results, "prediksi.generate_pdf", n,
+                lambda: prediksi.generate_pdf(lulus, tidak, 75, eval_df, "Bench"), repeat)
+        rapor_df = df_siswa[["NIS", "Nama", "Kelas"] + nilai_cols]
+        _record(results, "rapor.generate_pdf", n,
+                lambda: rapor.generate_pdf(rapor_df, "bench.pdf"), repeat)
+        # Jalur export massal: surat per siswa (maks. 100 surat per ukuran)
+        surat = scored.head(100).to_dict("records")
+        _record(results, "prediksi.pdf_siswa.x100", n, lambda: [
+            prediksi.generate_pdf_siswa(r["Nama"], r["NIS"], r["Rata-rata"], r["Bonus_Ekstra"], r["Target"], 75, r.get("Alpa"))
+            for r in surat
+        ], repeat)
+
+    # Pemadatan tipe saat ingest (dataset yang disimpan = versi padat, seperti di app)
+    _record(results, "dtypes.compact_df", n, lambda: dtypes.compact_df(df_siswa), repeat)
+    df_padat = dtypes.compact_df(df_siswa)
+    print(f"  memori dataset: {dtypes.format_bytes(dtypes.memory_bytes(df_siswa))}"
+          f" → {dtypes.format_bytes(dtypes.memory_bytes(df_padat))}")
+
+    # Penyimpanan dataset + sync siswa_master (DB sementara di cwd)
+    dataset_store.invalidate()
+    _record(results, "save_dataset_to_db", n, lambda: app.save_dataset_to_db(df_padat), repeat)
+
+    def load_dingin():
+        dataset_store.invalidate()
+        app.load_dataset_from_db()
+    _record(results, "load_dataset_from_db.cold", n, load_dingin, repeat)
+    app.load_dataset_from_db()
+    _record(results, "load_dataset_from_db.warm", n, app.load_dataset_from_db, repeat)
+
+    def reset_master():
+        data_siswa.init_db()
+        conn = connection.get_conn(data_siswa.DB_FILE)
+        conn.execute("DELETE FROM siswa_master")
+        conn.commit()
+    _record(results, "sync_from_dataset.full", n, data_siswa.sync_from_dataset, 1, setup=reset_master)
+    _record(results, "sync_from_dataset.noop", n, data_siswa.sync_from_dataset, repeat)
+
+# =========================
+# Perbandingan dengan hasil lama
+# =========================
+def compare(old_path, results, threshold):
+    with open(old_path, encoding="utf-8") as f:
+        old = {(r["name"], r["rows"]): r for r in json.load(f)["results"] if "min_s" in r}
+    print(f"\n== Dibanding {old_path} (regresi jika > +{threshold:.0%}) ==")
+    regresi = 0
+    for r in results:
+        o = old.get((r["name"], r["rows"]))
+        if o is None or "min_s" not in r or o["min_s"] <= 0:
+            continue
+        rasio = r["min_s"] / o["min_s"]
+        tanda = "REGRESI" if rasio > 1 + threshold else ""
+        regresi += bool(tanda)
+        print(f"  {r['name']:<28} {r['rows']:>9,}  {o['min_s']:.4f}s → {r['min_s']:.4f}s  x{rasio:.2f} {tanda}")
+    return regresi
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark prediksi kelulusan")
+    p.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    p.add_argument("--repeat", type=int, default=3, help="ulangan untuk ukuran < 100k")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--pdf-max-rows", type=int, default=10_000)
+    p.add_argument("--train-max-rows", type=int, default=1_000_000)
+    p.add_argument("--out", default="bench_results.json")
+    p.add_argument("--compare", help="file hasil lama untuk dibandingkan")
+    p.add_argument("--regression-threshold", type=float, default=0.2)
+    args = p.parse_args(argv)
+
+    out_path = os.path.abspath(args.out)
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+    warnings.filterwarnings("ignore")
+
+    results = []
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="bench_")
+    try:
+        # Semua DB/backup ditulis ke folder sementara, bukan DB asli
+        os.chdir(workdir)
+        for n in args.sizes:
+            bench_size(n, args, results)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"meta": _meta(), "results": results}, f, indent=2)
+    print(f"\nHasil ditulis ke {out_path}")
+
+    if compare_path:
+        return 1 if compare(compare_path, results, args.regression_threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,7 @@
 import os
-import sqlite3
-import base64
 import streamlit as st
-import pandas as pd
 import views.prediksi as prediksi
+from utils import connection, assets, dataset_store
 
 DB_PATH = "data.db"
 DATASET_PATH = os.path.join("data", "dataset.xlsx")
@@ -12,33 +10,30 @@ DATASET_PATH = os.path.join("data", "dataset.xlsx")
 # DB Setup
 # =========================
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE,
-            password TEXT,
-            role TEXT CHECK(role IN ('Admin'))
-        )
-    """)
-    # Tambahkan admin default
-    c.execute("SELECT * FROM users WHERE username='admin'")
-    if not c.fetchone():
-        c.execute("INSERT INTO users (username,password,role) VALUES (?,?,?)",
-                  ("admin", "admin123", "Admin"))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE,
+                password TEXT,
+                role TEXT CHECK(role IN ('Admin'))
+            )
+        """)
+        # Tambahkan admin default
+        c.execute("SELECT * FROM users WHERE username='admin'")
+        if not c.fetchone():
+            c.execute("INSERT INTO users (username,password,role) VALUES (?,?,?)",
+                      ("admin", "admin123", "Admin"))
 
 # =========================
 # Auth Check
 # =========================
 def check_login_admin(username, password):
-    conn = sqlite3.connect(DB_PATH)
+    conn = connection.get_conn(DB_PATH)
     c = conn.cursor()
     c.execute("SELECT role FROM users WHERE username=? AND password=?", (username, password))
     result = c.fetchone()
-    conn.close()
     if result and result[0] == "Admin":
         return {"role": "Admin", "username": username}
     return None
@@ -48,23 +43,10 @@ def check_login_admin(username, password):
 # =========================
 def set_bg(image_file="assets/img/bg8.jpg"):
     try:
-        BASE_DIR = os.path.dirname(__file__)
-        image_file = os.path.join(BASE_DIR, image_file)
-        if os.path.exists(image_file):
-            with open(image_file, "rb") as f:
-                data = f.read()
-            b64 = base64.b64encode(data).decode()
-            ext = os.path.splitext(image_file)[1][1:]
-            st.markdown(
-                f"""
-                <style>
-                .stApp {{
-                    background: url("data:image/{ext};base64,{b64}") no-repeat center center fixed;
-                    background-size: cover;
-                }}
-                </style>
-                """, unsafe_allow_html=True
-            )
+        # Varian terkompresi dibuat sekali & dilayani sebagai file statis (lihat utils/assets.py)
+        css = assets.background_css(image_file)
+        if css:
+            st.markdown(css, unsafe_allow_html=True)
     except Exception as e:
         st.warning(f"⚠️ Background tidak dimuat: {e}")
 
@@ -74,15 +56,12 @@ def set_bg(image_file="assets/img/bg8.jpg"):
 def login_page():
     init_db()
     set_bg()
-    logo_path = os.path.join(os.path.dirname(__file__), "assets", "img", "logo.png")
 
-    # Load dataset sekali saja
+    # Load dataset sekali saja (di-parse sekali per proses & dibagi antar sesi)
     if "dataset" not in st.session_state:
         try:
             if os.path.exists(DATASET_PATH):
-                df = pd.read_excel(DATASET_PATH)
-                df.columns = df.columns.str.strip()
-                st.session_state["dataset"] = df
+                st.session_state["dataset"] = dataset_store.load_file(DATASET_PATH)
             else:
                 st.error(f"❌ File {DATASET_PATH} tidak ditemukan!")
         except Exception as e:
@@ -100,8 +79,7 @@ def login_page():
 
     col1, col2 = st.columns([1,1])
     with col1:
-        if os.path.exists(logo_path):
-            st.image(logo_path, width=160)
+        assets.image("logo.png", width=160)
         st.markdown("<h3 style='color:white'>Sistem Prediksi Kelulusan Siswa</h3>", unsafe_allow_html=True)
         st.markdown("<p style='color:white'>SMK Ma'arif NU 01 Karangkobar</p>", unsafe_allow_html=True)
 
@@ -0,0 +1,126 @@
+# utils/assets.py
+# ==========================================================
+# Pipeline aset statis (background login, logo)
+# - Kompres & resize sekali (WebP + JPEG progresif / PNG)
+# - Nama file berisi hash konten → aman di-cache lama oleh browser
+# - Dilayani lewat static serving Streamlit (app/static/...),
+#   fallback ke data URI (di-cache di memori) jika tidak aktif
+# ==========================================================
+import os
+import io
+import base64
+import hashlib
+import functools
+import streamlit as st
+from PIL import Image
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, "assets", "img")
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+STATIC_URL = "app/static"
+
+BG_WIDTH = 1920       # lebar background (viewport desktop umum)
+LOGO_WIDTH = 320      # cukup untuk sidebar / kartu profil
+WEBP_QUALITY = 75
+JPEG_QUALITY = 80
+
+MIME = {"webp": "image/webp", "jpg": "image/jpeg", "png": "image/png"}
+
+# =========================
+# Build varian (sekali per file sumber + mtime)
+# =========================
+def _src_path(name):
+    # "logo.png" → assets/img/logo.png; path lain relatif ke root proyek
+    if os.path.dirname(name):
+        return os.path.join(BASE_DIR, name)
+    return os.path.join(SRC_DIR, name)
+
+@functools.lru_cache(maxsize=64)
+def _build(src, mtime, max_width, fmt):
+    """Resize + encode, tulis ke static/. Kembalikan (nama_file, bytes)."""
+    with Image.open(src) as im:
+        im.load()
+        if im.width > max_width:
+            im = im.resize((max_width, round(im.height * max_width / im.width)), Image.LANCZOS)
+        buf = io.BytesIO()
+        if fmt == "webp":
+            im.save(buf, "WEBP", quality=WEBP_QUALITY, method=4)
+        elif fmt == "jpg":
+            im.convert("RGB").save(buf, "JPEG", quality=JPEG_QUALITY, progressive=True, optimize=True)
+        else:
+            im.save(buf, "PNG", optimize=True)
+    data = buf.getvalue()
+    digest = hashlib.sha1(data).hexdigest()[:10]
+    stem = os.path.splitext(os.path.basename(src))[0]
+    fname = f"{stem}-{max_width}-{digest}.{fmt}"
+    try:
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        path = os.path.join(STATIC_DIR, fname)
+        if not os.path.exists(path):
+            tmp = f"{path}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+    except OSError:
+        pass  # tetap bisa dipakai lewat data URI
+    return fname, data
+
+@functools.lru_cache(maxsize=64)
+def _data_uri(src, mtime, max_width, fmt):
+    _, data = _build(src, mtime, max_width, fmt)
+    return f"data:{MIME[fmt]};base64,{base64.b64encode(data).decode()}"
+
+def _static_enabled():
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+def url(name, max_width, fmt):
+    """URL varian aset; None jika file sumber tidak ada."""
+    src = _src_path(name)
+    if not os.path.exists(src):
+        return None
+    mtime = os.path.getmtime(src)
+    fname, _ = _build(src, mtime, max_width, fmt)
+    if _static_enabled() and os.path.exists(os.path.join(STATIC_DIR, fname)):
+        # ?v= → Tornado mengirim Cache-Control max-age panjang
+        return f"{STATIC_URL}/{fname}?v={fname.rsplit('-', 1)[1].split('.')[0]}"
+    return _data_uri(src, mtime, max_width, fmt)
+
+# =========================
+# Helper tampilan
+# =========================
+def background_css(name="bg8.jpg"):
+    """CSS background .stApp: WebP untuk browser modern, JPEG progresif sebagai cadangan."""
+    webp = url(name, BG_WIDTH, "webp")
+    if webp is None:
+        return ""
+    if _static_enabled():
+        jpg = url(name, BG_WIDTH, "jpg")
+        image_css = f'url("{jpg}"); background-image: image-set(url("{webp}") type("image/webp"), url("{jpg}") type("image/jpeg"))'
+    else:
+        # Data URI: kirim satu varian saja (WebP) supaya payload tidak dobel
+        image_css = f'url("{webp}")'
+    return f"""
+        <style>
+        .stApp {{
+            background: no-repeat center center fixed;
+            background-image: {image_css};
+            background-size: cover;
+        }}
+        </style>
+        """
+
+def image(name, width=None, sidebar=False, max_width=LOGO_WIDTH):
+    """Tampilkan gambar kecil (logo) lewat URL statis. width=None → lebar kolom penuh.
+
+    Kembalikan False jika file sumber tidak ada.
+    """
+    src = url(name, max_width, "webp")
+    if src is None:
+        return False
+    style = f"width:{width}px" if width else "width:100%"
+    target = st.sidebar if sidebar else st
+    target.markdown(f'<img src="{src}" style="{style};height:auto" alt="">', unsafe_allow_html=True)
+    return True
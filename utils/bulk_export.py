@@ -0,0 +1,133 @@
+# utils/bulk_export.py
+# ==========================================================
+# Export dokumen massal → satu file ZIP
+# - Surat hasil prediksi tiap siswa + rapor per KELAS
+# - Dirender paralel di process pool (per potongan CHUNK siswa)
+# - PDF langsung ditulis ke ZIP di disk begitu selesai (tidak ditumpuk)
+# - manifest.csv di dalam ZIP: file, jenis, identitas, status, ukuran
+# ==========================================================
+import os
+import re
+import time
+import zipfile
+import pandas as pd
+from utils import workers
+
+EXPORT_DIR = os.path.join("data", "exports")
+CHUNK = 25              # siswa per tugas worker (overhead pickle vs. pembagian beban)
+KEEP_EXPORTS = 5        # file ZIP lama yang disimpan
+SURAT_COLS = ["NIS", "Nama", "Rata-rata", "Bonus_Ekstra", "Target", "Alpa"]
+MANIFEST_COLS = ["File", "Jenis", "NIS", "Nama", "Kelas", "Status", "Bytes"]
+
+def _nama_file(teks) -> str:
+    teks = re.sub(r"[^\w\-]+", "_", str(teks).strip()).strip("_")
+    return teks or "tanpa_nama"
+
+# =========================
+# Tugas worker (level modul → bisa di-pickle)
+# =========================
+def _render_surat(args):
+    """1 potongan siswa → [(arcname, bytes|None, baris manifest)]."""
+    from views.prediksi import generate_pdf_siswa
+    records, threshold = args
+    out = []
+    for r in records:
+        arcname = f"surat/{_nama_file(r.get('NIS'))}_{_nama_file(r.get('Nama'))}.pdf"
+        info = {"File": arcname, "Jenis": "surat", "NIS": r.get("NIS"), "Nama": r.get("Nama"), "Kelas": r.get("Kelas")}
+        try:
+            alpa = r.get("Alpa")
+            data = generate_pdf_siswa(
+                r.get("Nama"), r.get("NIS"), r.get("Rata-rata"), r.get("Bonus_Ekstra"),
+                r.get("Target"), threshold, None if pd.isna(alpa) else alpa
+            )
+            out.append((arcname, data, {**info, "Status": "OK"}))
+        except Exception as e:
+            out.append((arcname, None, {**info, "Status": f"Gagal: {e}"}))
+    return out
+
+def _render_rapor(args):
+    """1 kelas → [(arcname, bytes|None, baris manifest)]."""
+    from views.rapor import generate_pdf
+    kelas, df = args
+    arcname = f"rapor/Rapor_{_nama_file(kelas)}.pdf"
+    info = {"File": arcname, "Jenis": "rapor", "NIS": None, "Nama": f"{len(df)} siswa", "Kelas": kelas}
+    try:
+        data = generate_pdf(df, f"{kelas}.pdf").getvalue()
+        return [(arcname, data, {**info, "Status": "OK"})]
+    except Exception as e:
+        return [(arcname, None, {**info, "Status": f"Gagal: {e}"})]
+
+def _jalankan(task):
+    fn, args = task
+    return fn(args)
+
+# =========================
+# Daftar tugas
+# =========================
+def tugas_surat(hasil: pd.DataFrame, threshold, chunk=CHUNK):
+    """Potongan baris hasil prediksi (kolom SURAT_COLS + Kelas jika ada)."""
+    cols = [c for c in SURAT_COLS + ["Kelas"] if c in hasil.columns]
+    records = hasil[cols].astype(object).where(hasil[cols].notna(), None).to_dict("records")
+    return [(records[i:i + chunk], threshold) for i in range(0, len(records), chunk)]
+
+def tugas_rapor(rapor: pd.DataFrame, kelas_col="Kelas"):
+    """Satu tugas per kelas (urut nama kelas)."""
+    if rapor is None or kelas_col not in rapor.columns:
+        return []
+    kelas = rapor[kelas_col].astype(object).fillna("-").astype(str)
+    return [(k, rapor[(kelas == k).to_numpy()]) for k in sorted(kelas.unique())]
+
+# =========================
+# Export
+# =========================
+def _cleanup(keep=KEEP_EXPORTS):
+    try:
+        files = sorted(
+            (os.path.join(EXPORT_DIR, f) for f in os.listdir(EXPORT_DIR) if f.endswith(".zip")),
+            key=os.path.getmtime
+        )
+    except OSError:
+        return
+    for path in files[:-keep]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def export_zip(hasil: pd.DataFrame, threshold, rapor: pd.DataFrame = None, path=None, progress=None):
+    """Render semua surat + rapor per kelas ke ZIP di `path`.
+
+    Kembalikan (path, manifest DataFrame). `progress(selesai, total)` dipanggil
+    tiap tugas selesai (exception dari progress membatalkan sisa tugas).
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = path or os.path.join(EXPORT_DIR, f"dokumen_{time.strftime('%Y%m%d_%H%M%S')}.zip")
+    tasks = [(_render_surat, t) for t in tugas_surat(hasil, threshold)]
+    tasks += [(_render_rapor, t) for t in tugas_rapor(rapor)]
+
+    manifest, dipakai = [], set()
+    tmp = f"{path}.tmp"
+    try:
+        # PDF fpdf2 sudah terkompresi → ZIP_STORED (tanpa kompresi ulang)
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as zf:
+            for i, hasil_tugas in enumerate(workers.imap_unordered(_jalankan, tasks), 1):
+                for arcname, data, info in hasil_tugas:
+                    # NIS + nama kembar → beri akhiran supaya nama file di ZIP unik
+                    base, n = arcname[:-4], 2
+                    while arcname in dipakai:
+                        arcname, n = f"{base}_{n}.pdf", n + 1
+                    dipakai.add(arcname)
+                    info["File"] = arcname
+                    if data is not None:
+                        zf.writestr(arcname, data)
+                    manifest.append({**info, "Bytes": len(data) if data is not None else 0})
+                if progress is not None:
+                    progress(i, len(tasks))
+            manifest_df = pd.DataFrame(manifest, columns=MANIFEST_COLS).sort_values(["Jenis", "File"], ignore_index=True)
+            zf.writestr("manifest.csv", manifest_df.to_csv(index=False))
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    _cleanup()
+    return path, manifest_df
@@ -0,0 +1,94 @@
+# utils/chart_data.py
+# ==========================================================
+# Data grafik yang sudah diagregasi di server (NumPy)
+# - Histogram (bin "rapi" seperti Vega-Lite), hitungan per kategori, KDE
+# - Yang dikirim ke browser hanya titik hasil agregasi,
+#   dibatasi MAX_POINTS per grafik (bukan seluruh baris dataset)
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+MAX_POINTS = 500        # batas keras jumlah baris data per grafik
+KDE_GRID = 512          # resolusi grid KDE (binned) sebelum diringkas
+LAINNYA = "Lainnya"
+
+def _values(values) -> np.ndarray:
+    arr = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype="float64")
+    return arr[np.isfinite(arr)]
+
+def _nice_step(span, maxbins):
+    # Langkah bin 1/2/5 × 10^k terkecil yang menghasilkan <= maxbins bin
+    if span <= 0:
+        return 1.0
+    raw = span / maxbins
+    mag = 10 ** np.floor(np.log10(raw))
+    for m in (1, 2, 5, 10):
+        if m * mag >= raw:
+            return float(m * mag)
+    return float(10 * mag)
+
+# =========================
+# Histogram
+# =========================
+def histogram(values, maxbins=20) -> pd.DataFrame:
+    """Kolom: Mulai, Akhir, Jumlah (bin kosong di tengah tetap ada)."""
+    arr = _values(values)
+    maxbins = max(1, min(int(maxbins), MAX_POINTS))
+    if arr.size == 0:
+        return pd.DataFrame({"Mulai": [], "Akhir": [], "Jumlah": []})
+    vmin, vmax = arr.min(), arr.max()
+    step = _nice_step(vmax - vmin, maxbins)
+    start = np.floor(vmin / step) * step
+    n_bins = max(1, int(np.ceil((vmax - start) / step + 1e-9)))
+    if start + n_bins * step <= vmax:
+        n_bins += 1     # nilai maksimum tepat di tepi → masuk bin terakhir
+    edges = start + step * np.arange(n_bins + 1)
+    counts, _ = np.histogram(arr, bins=edges)
+    return pd.DataFrame({"Mulai": edges[:-1], "Akhir": edges[1:], "Jumlah": counts})
+
+# =========================
+# KDE (binned Gaussian, O(n))
+# =========================
+def kde(values, points=100, scale_to=None) -> pd.DataFrame:
+    """Kurva densitas (bandwidth Scott). Kolom: Nilai, Densitas.
+
+    scale_to=(n, lebar_bin) → densitas dikali n × lebar_bin supaya
+    sejajar dengan histogram hitungan.
+    """
+    arr = _values(values)
+    points = max(2, min(int(points), MAX_POINTS))
+    if arr.size < 2 or arr.std() == 0:
+        return pd.DataFrame({"Nilai": [], "Densitas": []})
+    bw = 1.06 * arr.std(ddof=1) * arr.size ** (-1 / 5)
+    lo, hi = arr.min() - 3 * bw, arr.max() + 3 * bw
+    # Histogram halus lalu konvolusi dengan kernel Gaussian
+    grid_counts, edges = np.histogram(arr, bins=KDE_GRID, range=(lo, hi))
+    dx = edges[1] - edges[0]
+    half = int(np.ceil(4 * bw / dx))
+    k = np.exp(-0.5 * (np.arange(-half, half + 1) * dx / bw) ** 2)
+    dens = np.convolve(grid_counts, k / (k.sum() * dx), mode="same") / arr.size
+    centers = (edges[:-1] + edges[1:]) / 2
+    x = np.linspace(lo, hi, points)
+    y = np.interp(x, centers, dens)
+    if scale_to is not None:
+        n, width = scale_to
+        y = y * n * width
+    return pd.DataFrame({"Nilai": x, "Densitas": y})
+
+# =========================
+# Kategori
+# =========================
+def counts(values, label="Kategori", limit=MAX_POINTS) -> pd.DataFrame:
+    """Jumlah per kategori; kategori di luar `limit` terbesar digabung ke 'Lainnya'."""
+    s = pd.Series(values).astype(object).fillna("-").astype(str)
+    vc = s.value_counts(sort=True)
+    limit = max(1, min(int(limit), MAX_POINTS))
+    if len(vc) > limit:
+        vc = pd.concat([vc.iloc[:limit - 1], pd.Series({LAINNYA: vc.iloc[limit - 1:].sum()})])
+    return pd.DataFrame({label: vc.index.astype(str), "Jumlah": vc.to_numpy()})
+
+def top_n(df: pd.DataFrame, col, n=10, columns=None) -> pd.DataFrame:
+    """n baris dengan nilai `col` terbesar (hanya kolom yang dibutuhkan grafik)."""
+    n = max(1, min(int(n), MAX_POINTS))
+    out = df.nlargest(n, col)
+    return out[columns] if columns is not None else out
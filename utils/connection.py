@@ -0,0 +1,61 @@
+# utils/connection.py
+# ==========================================================
+# Manajemen koneksi SQLite bersama untuk semua modul
+# - 1 koneksi per thread per file DB (dipakai ulang, tidak dibuka-tutup)
+# - WAL journal, synchronous=NORMAL, mmap, busy timeout
+# ==========================================================
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+BUSY_TIMEOUT_MS = 5000
+MMAP_SIZE = 256 * 1024 * 1024
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA mmap_size={MMAP_SIZE}",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store=MEMORY",
+)
+
+_local = threading.local()
+
+def _open(path):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def get_conn(path) -> sqlite3.Connection:
+    """Koneksi milik thread ini untuk file DB `path` (jangan di-close oleh pemanggil)."""
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = {}
+    key = os.path.abspath(path)
+    conn = pool.get(key)
+    if conn is None:
+        conn = pool[key] = _open(path)
+    return conn
+
+@contextmanager
+def transaction(path):
+    """Commit otomatis jika sukses, rollback jika error."""
+    conn = get_conn(path)
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+def close_all():
+    """Tutup semua koneksi milik thread ini (mis. saat shutdown / test)."""
+    pool = getattr(_local, "pool", {})
+    for conn in pool.values():
+        try:
+            conn.close()
+        except Exception:
+            pass
+    pool.clear()
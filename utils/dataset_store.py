@@ -0,0 +1,370 @@
+# utils/dataset_store.py
+# ==========================================================
+# Penyimpanan dataset nilai + cache per versi
+# - Data: file Parquet kolumnar per versi (data/dataset/siswa_v{N}.parquet)
+#   → baca sebagian kolom saja (proyeksi) + memory map
+# - SQLite (database.db): versi, metadata, dan lookup NIS/nama ber-index
+# Versi dinaikkan setiap save → pembaca hanya baca ulang
+# jika data benar-benar berubah.
+# - Satu frame per versi dibagi ke semua sesi (salinan dangkal;
+#   copy-on-write diaktifkan di app.py), bukan satu salinan penuh per sesi
+# - Skema kolom (peran tiap kolom, utils/schema.py) disimpan bersama
+#   versi dataset di dataset_meta
+# ==========================================================
+import os
+import sqlite3
+import threading
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from utils import connection, profiling, dtypes, ingest, schema
+
+DB_FILE = "database.db"
+PARQUET_DIR = os.path.join("data", "dataset")
+PARQUET_COMPRESSION = "snappy"   # dekompresi murah untuk baca berulang
+TABLE = "siswa"                  # tabel lama (sebelum Parquet), dimigrasi sekali
+LOOKUP_TABLE = "siswa_lookup"
+
+_cache = {"version": None, "df": None, "schema": None}
+_roles_cache = {"version": None, "roles": None}
+_file_cache = {}                 # path → (mtime, df) untuk dataset dari file
+_lock = threading.Lock()
+_read_lock = threading.Lock()    # cegah banyak sesi membaca file yang sama bersamaan
+_write_lock = threading.Lock()
+
+# =========================
+# Versi dataset
+# =========================
+def _init_version(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dataset_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    conn.execute("INSERT OR IGNORE INTO dataset_version (id, version) VALUES (1, 0)")
+
+def get_version(conn=None) -> int:
+    """Versi dataset saat ini (0 = belum pernah disimpan lewat store)."""
+    conn = conn or connection.get_conn(DB_FILE)
+    try:
+        row = conn.execute("SELECT version FROM dataset_version WHERE id = 1").fetchone()
+        return row[0] if row else 0
+    except sqlite3.OperationalError:
+        return 0
+
+def bump_version(conn) -> int:
+    _init_version(conn)
+    conn.execute("UPDATE dataset_version SET version = version + 1 WHERE id = 1")
+    return conn.execute("SELECT version FROM dataset_version WHERE id = 1").fetchone()[0]
+
+# =========================
+# Metadata dataset (key-value)
+# =========================
+def set_meta(conn, key, value):
+    conn.execute("CREATE TABLE IF NOT EXISTS dataset_meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT OR REPLACE INTO dataset_meta (key, value) VALUES (?, ?)", (key, value))
+
+def get_meta(key, default=None, conn=None):
+    conn = conn or connection.get_conn(DB_FILE)
+    try:
+        row = conn.execute("SELECT value FROM dataset_meta WHERE key = ?", (key,)).fetchone()
+    except sqlite3.OperationalError:
+        return default
+    return row[0] if row else default
+
+def get_source_hash():
+    """Hash konten file upload yang menghasilkan dataset saat ini (None jika tidak diketahui)."""
+    return get_meta("source_hash")
+
+def get_roles(version=None):
+    """Skema kolom (schema.Schema) dataset versi `version` (default: terbaru);
+    dibaca sekali per versi. None jika belum ada dataset."""
+    with _lock:
+        if (version is not None and _roles_cache["version"] == version
+                and _roles_cache["roles"] is not None):
+            return _roles_cache["roles"]
+    # Versi + metadata skema dibaca dalam 1 transaksi (ditulis bersama di save_dataset)
+    conn = connection.get_conn(DB_FILE)
+    conn.execute("BEGIN")
+    try:
+        terbaru = get_version(conn)
+        teks = get_meta("schema", conn=conn)
+    finally:
+        conn.commit()
+    version = terbaru if version is None else version
+    with _lock:
+        if _roles_cache["version"] == version and _roles_cache["roles"] is not None:
+            return _roles_cache["roles"]
+    if teks and version == terbaru:
+        roles = schema.Schema.from_json(teks)
+    else:
+        # Dataset lama (sebelum ada metadata skema) atau versi yang sudah tergantikan
+        # → resolusi dari metadata file Parquet versi itu
+        path = parquet_path(version)
+        if not os.path.exists(path):
+            if version == terbaru and _current_path(conn)[1] is None:
+                return None
+            return get_roles()
+        numerik = _numerik(pq.read_schema(path))
+        roles = schema.resolve(list(numerik), list(numerik.values()))
+    with _lock:
+        _roles_cache["version"], _roles_cache["roles"] = version, roles
+    return roles
+
+# =========================
+# Parquet
+# =========================
+def parquet_path(version) -> str:
+    return os.path.join(PARQUET_DIR, f"siswa_v{version}.parquet")
+
+def write_parquet(df: pd.DataFrame, path, compression=PARQUET_COMPRESSION):
+    """Tulis Parquet secara atomik (tmp + rename)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    try:
+        df.to_parquet(tmp, engine="pyarrow", compression=compression, index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Kolom object campuran (angka + teks) → simpan sebagai teks
+        safe = df.copy()
+        for c in safe.columns[safe.dtypes == object]:
+            safe[c] = safe[c].where(safe[c].isna(), safe[c].astype(str))
+        safe.to_parquet(tmp, engine="pyarrow", compression=compression, index=False)
+    os.replace(tmp, path)
+
+def _cleanup_parquet(version):
+    # Simpan versi sekarang + 1 sebelumnya (pembaca yang masih memegang versi lama);
+    # gagal hapus (mis. Windows, file masih di-mmap) → dicoba lagi saat save berikutnya
+    try:
+        names = os.listdir(PARQUET_DIR)
+    except OSError:
+        return
+    for name in names:
+        stem, ext = os.path.splitext(name)
+        if ext != ".parquet" or not stem.startswith("siswa_v") or not stem[7:].isdigit():
+            continue
+        if int(stem[7:]) < version - 1:
+            try:
+                os.remove(os.path.join(PARQUET_DIR, name))
+            except OSError:
+                pass
+
+def _migrate_legacy(conn):
+    """DB lama: dataset masih di tabel SQLite 'siswa' → pindahkan sekali ke Parquet."""
+    try:
+        df = pd.read_sql(f"SELECT * FROM {TABLE}", conn)
+    except Exception:
+        conn.rollback()
+        return None
+    return save_dataset(dtypes.compact_df(df), get_source_hash())
+
+def _current_path(conn=None):
+    """(versi, path Parquet) dataset saat ini; path None jika belum ada dataset."""
+    conn = conn or connection.get_conn(DB_FILE)
+    version = get_version(conn)
+    path = parquet_path(version)
+    if os.path.exists(path):
+        return version, path
+    version = _migrate_legacy(conn)
+    if version is None:
+        return None, None
+    return version, parquet_path(version)
+
+# =========================
+# Simpan / Load
+# =========================
+def save_dataset(df: pd.DataFrame, source_hash=None, roles=None) -> int:
+    """Tulis dataset sebagai Parquet versi baru, kembalikan versi baru.
+
+    roles: skema kolom hasil ingest (schema.Schema); None → diresolusi di sini.
+    """
+    roles = roles or schema.resolve_df(df)
+    with _write_lock:
+        # Versi baru ditulis ke file sendiri di dalam transaksi (BEGIN IMMEDIATE);
+        # pembaca tetap memakai file versi lama sampai commit
+        with connection.transaction(DB_FILE) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            version = bump_version(conn)
+            path = parquet_path(version)
+            with profiling.stage("dataset.write_parquet"):
+                write_parquet(df, path)
+            build_lookup(conn, df, roles)
+            set_meta(conn, "source_hash", source_hash)
+            set_meta(conn, "schema", roles.to_json())
+            conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        _cleanup_parquet(version)
+    invalidate()
+    return version
+
+def _numerik(skema_parquet):
+    return {f.name: pa.types.is_integer(f.type) or pa.types.is_floating(f.type) for f in skema_parquet}
+
+def get_schema():
+    """{kolom: numerik?} dari metadata Parquet (tanpa membaca data). None jika belum ada."""
+    version, path = _current_path()
+    if path is None:
+        return None
+    with _lock:
+        if _cache["version"] == version and _cache["schema"] is not None:
+            return dict(_cache["schema"])
+    hasil = _numerik(pq.read_schema(path))
+    with _lock:
+        if _cache["version"] != version:
+            _cache["version"], _cache["df"] = version, None
+        _cache["schema"] = hasil
+    return dict(hasil)
+
+def load_dataset(columns=None):
+    """Dataset terbaru; baca file hanya jika versi berubah. None jika belum ada dataset.
+
+    columns → hanya kolom tersebut yang dibaca (kolom yang tidak ada diabaikan).
+    """
+    version, path = _current_path()
+    if path is None:
+        return None
+    cached = _shared(version)
+    if cached is not None:
+        return _view(cached, columns)
+
+    if columns is not None:
+        # Proyeksi: baca kolom yang diminta saja, tidak disimpan di cache penuh
+        ada = set(pq.read_schema(path).names)
+        with profiling.stage("dataset.read_parquet_cols"):
+            with dtypes.arrow_strings():
+                return pd.read_parquet(path, columns=[c for c in columns if c in ada], memory_map=True)
+
+    return _view(_load_full(version, path), None)
+
+def load_versioned():
+    """(versi, dataset): frame dijamin milik versi yang dikembalikan (untuk cache
+    per versi, mis. utils/derived.py). (None, None) jika belum ada dataset."""
+    version, path = _current_path()
+    if path is None:
+        return None, None
+    cached = _shared(version)
+    if cached is None:
+        try:
+            cached = _load_full(version, path)
+        except FileNotFoundError:
+            # Versi ini sudah dibersihkan (save beruntun) → ambil versi terbaru
+            return load_versioned()
+    return version, _view(cached, None)
+
+def _load_full(version, path):
+    with _read_lock:
+        # Sesi lain mungkin sudah membaca versi ini selagi menunggu
+        df = _shared(version)
+        if df is None:
+            with profiling.stage("dataset.read_parquet"), dtypes.arrow_strings():
+                df = pd.read_parquet(path, memory_map=True)
+            with _lock:
+                _cache["version"], _cache["df"], _cache["schema"] = version, df, None
+    return df
+
+def _shared(version):
+    with _lock:
+        return _cache["df"] if _cache["version"] == version else None
+
+def _view(df, columns):
+    # Salinan dangkal (copy-on-write): murah, dan perubahan tidak bocor ke frame bersama
+    if columns is None:
+        return df.copy(deep=False)
+    return df[[c for c in columns if c in df.columns]]
+
+def load_file(path, columns=None):
+    """Dataset dari file CSV/XLSX, di-parse sekali per mtime lalu dibagi ke semua sesi.
+
+    Nama kolom di-strip dan tipe dipadatkan. FileNotFoundError jika file tidak ada.
+    """
+    key = os.path.abspath(path)
+    mtime = os.path.getmtime(key)
+    with _lock:
+        hit = _file_cache.get(key)
+    if hit is None or hit[0] != mtime:
+        with _read_lock:
+            with _lock:
+                hit = _file_cache.get(key)
+            if hit is None or hit[0] != mtime:
+                with profiling.stage("dataset.read_file"):
+                    # Per potongan: nama kolom di-strip & tipe dipadatkan
+                    df = ingest.read_any(key)
+                hit = (mtime, df)
+                with _lock:
+                    _file_cache[key] = hit
+    return _view(hit[1], columns)
+
+# =========================
+# Lookup siswa (NIS + nama ternormalisasi, ber-index)
+# =========================
+def norm_nis(nis) -> str:
+    """'1632', 1632, 1632.0, ' 1632 ' → '1632'."""
+    s = str(nis).strip()
+    return s[:-2] if s.endswith(".0") else s
+
+def norm_nama(nama) -> str:
+    return str(nama).strip().lower()
+
+def norm_nis_series(nis: pd.Series) -> pd.Series:
+    """Versi vektor dari norm_nis untuk satu kolom."""
+    return nis.astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+
+def _find_col(columns, name):
+    return next((c for c in columns if str(c).strip().lower() == name), None)
+
+def build_lookup(conn, df: pd.DataFrame, roles=None):
+    """Bangun ulang tabel lookup; row_id = posisi baris (0..n-1) di file Parquet."""
+    if roles is not None:
+        nis_col, nama_col = roles.col("NIS"), roles.col("Nama")
+    else:
+        nis_col, nama_col = _find_col(df.columns, "nis"), _find_col(df.columns, "nama")
+    conn.execute(f"DROP TABLE IF EXISTS {LOOKUP_TABLE}")
+    conn.execute(f"CREATE TABLE {LOOKUP_TABLE} (nis_key TEXT, nama_key TEXT, row_id INTEGER)")
+    if nis_col is not None:
+        nis_key = norm_nis_series(df[nis_col])
+        nama_key = (df[nama_col].astype(str).str.strip().str.lower()
+                    if nama_col is not None else pd.Series("", index=df.index))
+        rows = zip(nis_key.tolist(), nama_key.tolist(), range(len(df)))
+        conn.executemany(f"INSERT INTO {LOOKUP_TABLE} VALUES (?,?,?)", rows)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{LOOKUP_TABLE}_key ON {LOOKUP_TABLE} (nis_key, nama_key)")
+
+def get_siswa(nis, nama=None):
+    """Ambil baris satu siswa via index lookup. None jika dataset belum ada;
+    frame kosong (kolom dataset) jika siswa tidak ditemukan."""
+    conn = connection.get_conn(DB_FILE)
+    if _current_path(conn)[1] is None:     # sekaligus migrasi DB lama
+        return None
+    where, params = "nis_key = ?", [norm_nis(nis)]
+    if nama is not None:
+        where += " AND nama_key = ?"
+        params.append(norm_nama(nama))
+    # Versi + row_id dibaca dalam 1 transaksi baca (snapshot WAL yang sama):
+    # save_dataset yang commit di antaranya tidak bisa mencampur posisi baris
+    # file baru dengan file/frame versi lama
+    conn.execute("BEGIN")
+    try:
+        version = get_version(conn)
+        ids = [r[0] for r in conn.execute(
+            f"SELECT row_id FROM {LOOKUP_TABLE} WHERE {where} ORDER BY row_id", params
+        )]
+    finally:
+        conn.commit()
+    path = parquet_path(version)
+    cached = _shared(version)
+    try:
+        if cached is None and not ids:
+            # Tidak ditemukan: cukup skema file, tanpa membaca data
+            with dtypes.arrow_strings():
+                return pq.read_schema(path).empty_table().to_pandas()
+        if cached is None:
+            # Dibaca sekali lewat cache bersama, lookup berikutnya langsung iloc
+            cached = _load_full(version, path)
+    except FileNotFoundError:
+        # Versi ini sudah dibersihkan (save beruntun) → ulangi pada versi terbaru
+        if get_version(conn) != version:
+            return get_siswa(nis, nama)
+        raise
+    return cached.iloc[ids].reset_index(drop=True)
+
+def invalidate():
+    with _lock:
+        _cache["version"], _cache["df"], _cache["schema"] = None, None, None
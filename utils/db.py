@@ -1,18 +1,19 @@
-import sqlite3
 import pandas as pd
+from utils import connection
 
 DB_NAME = "akademik.db"
 
 def get_conn():
-    return sqlite3.connect(DB_NAME, check_same_thread=False)
+    return connection.get_conn(DB_NAME)
 
 # =========================
 # INIT DATABASE
 # =========================
 def init_db():
-    conn = get_conn()
-    cur = conn.cursor()
+    with connection.transaction(DB_NAME) as conn:
+        _buat_tabel(conn.cursor())
 
+def _buat_tabel(cur):
     # Tabel Guru
     cur.execute("""
     CREATE TABLE IF NOT EXISTS guru (
@@ -39,9 +40,6 @@ def init_db():
     if not cur.fetchone():
         cur.execute("INSERT INTO users (username,password,role) VALUES (?,?,?)",
                     ("admin","admin123","Admin"))
-    
-    conn.commit()
-    conn.close()
 
 # =========================
 # CRUD GURU
@@ -49,29 +47,22 @@ def init_db():
 def get_guru():
     conn = get_conn()
     df = pd.read_sql("SELECT * FROM guru", conn)
-    conn.close()
     return df
 
 def add_guru(nama, nip, mapel):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("INSERT INTO guru (Nama, NIP, Mapel) VALUES (?, ?, ?)", (nama, nip, mapel))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_NAME) as conn:
+        cur = conn.cursor()
+        cur.execute("INSERT INTO guru (Nama, NIP, Mapel) VALUES (?, ?, ?)", (nama, nip, mapel))
 
 def update_guru(id_guru, nama, nip, mapel):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("UPDATE guru SET Nama=?, NIP=?, Mapel=? WHERE id=?", (nama, nip, mapel, id_guru))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_NAME) as conn:
+        cur = conn.cursor()
+        cur.execute("UPDATE guru SET Nama=?, NIP=?, Mapel=? WHERE id=?", (nama, nip, mapel, id_guru))
 
 def delete_guru(id_guru):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM guru WHERE id=?", (id_guru,))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_NAME) as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM guru WHERE id=?", (id_guru,))
 
 # =========================
 # CRUD USERS
@@ -79,31 +70,24 @@ def delete_guru(id_guru):
 def get_users():
     conn = get_conn()
     df = pd.read_sql("SELECT id,username,role FROM users", conn)
-    conn.close()
     return df
 
 def add_user(username, password, role, linked_id=None):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("INSERT INTO users (username,password,role,linked_id) VALUES (?,?,?,?)",
-                (username,password,role,linked_id))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_NAME) as conn:
+        cur = conn.cursor()
+        cur.execute("INSERT INTO users (username,password,role,linked_id) VALUES (?,?,?,?)",
+                    (username,password,role,linked_id))
 
 def update_user(user_id, username, password, role):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("UPDATE users SET username=?, password=?, role=? WHERE id=?",
-                (username,password,role,user_id))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_NAME) as conn:
+        cur = conn.cursor()
+        cur.execute("UPDATE users SET username=?, password=?, role=? WHERE id=?",
+                    (username,password,role,user_id))
 
 def delete_user(user_id):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM users WHERE id=?", (user_id,))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_NAME) as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM users WHERE id=?", (user_id,))
 
 # Init DB sekali jalan
 init_db()
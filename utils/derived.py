@@ -0,0 +1,95 @@
+# utils/derived.py
+# ==========================================================
+# Data turunan dataset, dihitung sekali per versi dataset
+# - Kolom mapel dari skema kolom (utils/schema.py, tersimpan per versi)
+# - Rata-rata & total per siswa, flag lulus (rata-rata >= 70)
+# Dipakai dashboard, rapor, statistik, prediksi tanpa menyalin
+# atau menghitung ulang dataset di setiap rerun.
+# ==========================================================
+import threading
+import numpy as np
+import pandas as pd
+from utils.scoring import rata_rata
+from utils import schema
+
+BATAS_LULUS = 70        # batas lulus ringkasan dashboard (rata-rata mapel)
+
+def nilai_columns(columns, numerik):
+    """Kolom mapel dari daftar kolom + flag numerik per kolom."""
+    return schema.resolve(columns, numerik).mapel
+
+class DerivedData:
+    """Hasil turunan satu frame dataset (read-only).
+
+    roles: skema kolom tersimpan (schema.Schema); None → diresolusi dari df.
+    version: versi dataset asal df (None untuk dataset sesi yang diedit).
+    """
+
+    def __init__(self, df: pd.DataFrame, roles=None, version=None):
+        df = df.loc[:, ~df.columns.duplicated()]
+        self.version = version
+        self.index = df.index
+        self.n = len(df)
+        self.roles = roles or schema.resolve_df(df)
+        self.nilai_cols = [c for c in self.roles.mapel if c in df.columns]
+        self._nilai = df[self.nilai_cols].to_numpy(dtype="float64", na_value=np.nan) if self.nilai_cols else None
+        self._memo = {}
+        self._lock = threading.Lock()
+
+        kolom_rata = self.roles.col("Rata-rata")
+        if kolom_rata in df.columns:
+            # Rata-rata dari file dipakai apa adanya (seperti sebelumnya di tiap view)
+            self.rata = pd.to_numeric(df[kolom_rata], errors="coerce").astype("float64").rename("Rata-rata")
+        elif self._nilai is not None:
+            self.rata = pd.Series(rata_rata(self._nilai), index=self.index, name="Rata-rata")
+        else:
+            self.rata = None
+        if self._nilai is not None:
+            isi = ~np.isnan(self._nilai)
+            total = np.where(isi.any(axis=1), np.where(isi, self._nilai, 0.0).sum(axis=1), np.nan)
+            self.total = pd.Series(total, index=self.index, name="Total")
+        else:
+            self.total = None
+        self.lulus = self.rata >= BATAS_LULUS if self.rata is not None else None
+
+    def rata_rata(self, cols):
+        """Rata-rata per baris untuk subset kolom tertentu (mis. mapel prediksi), di-memo."""
+        key = tuple(cols)
+        with self._lock:
+            hit = self._memo.get(key)
+        if hit is None:
+            pos = [self.nilai_cols.index(c) for c in cols] if all(c in self.nilai_cols for c in cols) else None
+            if pos is None:
+                return None
+            hit = rata_rata(self._nilai[:, pos])
+            with self._lock:
+                self._memo[key] = hit
+        return hit
+
+# =========================
+# Cache per versi dataset
+# =========================
+_cache = {"version": None, "data": None}
+_lock = threading.Lock()
+
+def for_version(version, load_fn, roles_fn=None):
+    """DerivedData versi dataset `version`; load_fn() → (versi, df) dan roles_fn(versi)
+    → skema kolom dipanggil hanya saat versi berubah.
+
+    Hasil di-cache di bawah versi yang benar-benar dibaca load_fn (bisa lebih baru
+    dari `version` jika ada save di antaranya), bukan versi yang diminta.
+    """
+    with _lock:
+        if _cache["version"] == version and _cache["data"] is not None:
+            return _cache["data"]
+    versi, df = load_fn()
+    if df is None:
+        return None
+    data = DerivedData(df, roles_fn(versi) if roles_fn is not None else None, versi)
+    with _lock:
+        _cache["version"], _cache["data"] = versi, data
+    return data
+
+def compute(df: pd.DataFrame) -> DerivedData:
+    """Tanpa cache (mis. dataset sesi yang sudah diedit)."""
+    return DerivedData(df)
@@ -0,0 +1,151 @@
+# utils/dtypes.py
+# ==========================================================
+# Pemadatan tipe data saat ingest + laporan memori
+# - Nilai/absensi bulat 0..255 → uint8 (lebih besar → uint16/uint32)
+# - Nilai/absensi pecahan / ada kosong → float32 (NaN tetap NaN), hanya
+#   jika tepat: < 2^24 dan maks. 2 desimal; kolom angka lain (NIK,
+#   No HP, ...) tetap float64
+# - Kelas / Jurusan / Ekstra (teks berulang) → category
+# - NIS / NISN / teks lain → string (pyarrow)
+# ==========================================================
+import numpy as np
+import pandas as pd
+from utils import schema
+
+ID_COLS = {"nis", "nisn", "username", "password"}   # selalu teks, walau isinya angka
+TEXT_COLS = {"nama", "nama siswa"}                   # teks bebas, bukan category
+CATEGORY_COLS = {"kelas", "jurusan", "ekstra", "role"}
+CATEGORY_RATIO = 0.5    # teks lain jadi category jika nilai unik <= 50% baris
+STRING_DTYPE = "string[pyarrow]"
+FLOAT32_MAX_INT = 2 ** 24   # bilangan bulat di atas ini tidak lagi tepat di float32
+FLOAT32_ROLES = {schema.MAPEL, schema.ABSENSI}
+
+# =========================
+# Per kolom
+# =========================
+def _float32_aman(arr) -> bool:
+    """Semua nilai (tanpa NaN) kembali tepat dari float32 (lewat repr terpendeknya)."""
+    if not len(arr):
+        return True
+    if np.abs(arr).max() >= FLOAT32_MAX_INT:
+        return False
+    pecahan = arr[arr != np.floor(arr)]
+    # Pecahan: maks. 2 desimal & < 10.000 (<= 6 angka penting)
+    return not len(pecahan) or (
+        np.abs(pecahan).max() < 10_000 and (np.rint(pecahan * 100) / 100 == pecahan).all()
+    )
+
+def _numeric(s: pd.Series, float32=True) -> pd.Series:
+    """Angka → tipe unsigned terkecil jika bulat, >= 0 & tanpa NaN; selain itu
+    float32 (jika boleh & tepat) atau float64."""
+    arr = s.to_numpy(dtype="float64", na_value=np.nan)
+    isi = arr[~np.isnan(arr)]
+    if len(arr) and len(isi) == len(arr) and (arr >= 0).all() and (arr == np.floor(arr)).all():
+        return pd.to_numeric(s, downcast="unsigned")
+    if float32 and _float32_aman(isi):
+        return s.astype("float32")
+    return s.astype("float64")
+
+def _as_numeric(s: pd.Series):
+    """Kolom object yang seluruh isinya angka (mis. '85') → Series angka; selain itu None."""
+    isi = s.dropna()
+    # Cek sampel dulu → kolom teks biasa tidak perlu dikonversi penuh
+    if isi.empty or pd.to_numeric(isi.iloc[:100], errors="coerce").isna().any():
+        return None
+    num = pd.to_numeric(s, errors="coerce")
+    if num.notna().sum() == len(isi):
+        # Dari string arrow hasilnya Int64/Float64 → kembali ke numpy (uint8/float32)
+        return num.astype("float64") if isinstance(num.dtype, pd.api.extensions.ExtensionDtype) else num
+    return None
+
+def _id_string(s: pd.Series) -> pd.Series:
+    # 1632 / 1632.0 → "1632"; kosong tetap <NA>
+    if pd.api.types.is_integer_dtype(s):
+        return s.astype(STRING_DTYPE)
+    if pd.api.types.is_float_dtype(s):
+        arr = s.to_numpy(dtype="float64", na_value=np.nan)
+        isi = arr[~np.isnan(arr)]
+        if (isi == np.floor(isi)).all():
+            # Angka bulat + NaN → Int64 (NA tetap NA), tanpa format teks per sel
+            return s.astype("Int64").astype(STRING_DTYPE)
+    teks = s.astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+    return teks.where(s.notna()).astype(STRING_DTYPE)
+
+def compact_column(name, s: pd.Series, alias=None) -> pd.Series:
+    """alias: tabel alias schema (dibaca sekali oleh compact_df)."""
+    key = str(name).strip().lower()
+    if key in ID_COLS:
+        return _id_string(s)
+    if pd.api.types.is_bool_dtype(s) or isinstance(s.dtype, pd.CategoricalDtype):
+        return s
+    # float32 hanya untuk nilai mapel / absensi (peran dari nama kolom)
+    float32 = schema.role_for(name, True, alias) in FLOAT32_ROLES
+    if pd.api.types.is_numeric_dtype(s):
+        return _numeric(s, float32)
+    if s.dtype == object or isinstance(s.dtype, pd.StringDtype):
+        num = _as_numeric(s)
+        if num is not None:
+            return _numeric(num, float32)
+        s = s.astype(object)     # string arrow (ingest) → kategori berisi str biasa
+        teks = s.where(s.isna(), s.astype(str).str.strip())
+        if key in TEXT_COLS:
+            return teks.astype(STRING_DTYPE)
+        if key in CATEGORY_COLS or teks.nunique() <= CATEGORY_RATIO * len(teks):
+            return teks.astype("category")
+        return teks.astype(STRING_DTYPE)
+    return s
+
+# =========================
+# API DataFrame
+# =========================
+def compact_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Salinan df dengan tipe data terkecil yang aman per kolom."""
+    # Lewat posisi kolom (nama kolom boleh ganda)
+    alias = schema.alias_table()
+    out = pd.concat(
+        [compact_column(c, df.iloc[:, i], alias) for i, c in enumerate(df.columns)],
+        axis=1, keys=range(df.shape[1])
+    ) if df.shape[1] else df.copy()
+    out.columns = df.columns
+    return out
+
+def arrow_strings():
+    """Context baca Parquet: kolom string langsung jadi string[pyarrow] (tanpa salinan objek)."""
+    return pd.option_context("mode.string_storage", "pyarrow")
+
+def widen_for_edit(df: pd.DataFrame) -> pd.DataFrame:
+    """Tipe umum untuk st.data_editor: category → teks bebas, uint → Int64 (boleh
+    kosong, tetap tampil bulat), float32 → float64 dengan nilai asli (85.3, bukan
+    85.30000305)."""
+    out = df.copy()
+    for i, dtype in enumerate(out.dtypes):
+        if isinstance(dtype, pd.CategoricalDtype):
+            out.isetitem(i, out.iloc[:, i].astype(object))
+        elif pd.api.types.is_unsigned_integer_dtype(dtype):
+            out.isetitem(i, out.iloc[:, i].astype("Int64"))
+        elif dtype == "float32":
+            # repr terpendek float32 = nilai sumber (dijamin oleh _float32_aman)
+            teks = out.iloc[:, i].to_numpy().astype(str)
+            out.isetitem(i, pd.Series(teks.astype("float64"), index=out.index, name=out.columns[i]))
+    return out
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Pemakaian memori per kolom (byte, deep) + baris TOTAL."""
+    per_col = df.memory_usage(index=False, deep=True)
+    rep = pd.DataFrame({
+        "Kolom": [str(c) for c in df.columns],
+        "Tipe": [str(t) for t in df.dtypes],
+        "Bytes": per_col.to_numpy(),
+    })
+    total = pd.DataFrame({"Kolom": ["TOTAL"], "Tipe": [""], "Bytes": [memory_bytes(df)]})
+    return pd.concat([rep, total], ignore_index=True)
+
+def format_bytes(n) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
@@ -3,6 +3,7 @@ import os
 import io
 import pandas as pd
 import streamlit as st
+from utils import assets, dataset_store, dtypes, derived, ingest, schema
 
 PRIMARY = "#f5f5f5"     # teks putih
 ACCENT = "#52b87d"      # hijau aksen
@@ -79,10 +80,8 @@ def show_logo(location="main", width=110):
     candidates = ["assets/smk.png", "assets/img/smk.png"]
     for path in candidates:
         if os.path.exists(path):
-            if location == "sidebar":
-                st.sidebar.image(path, width=width)
-            else:
-                st.image(path, width=width)
+            # Versi kecil ter-cache (smk.png asli ± 2 MB)
+            assets.image(path, width=width, sidebar=(location == "sidebar"))
             return
     # fallback teks
     if location == "sidebar":
@@ -90,34 +89,117 @@ def show_logo(location="main", width=110):
     else:
         st.markdown("### 🏫 SMK Dashboard")
 
-# Kolom meta (bukan mapel)
-META_COLS = {"NO","NAMA","NIS","NISN","KELAS","TOTAL","SAKIT","IZIN","ALPA","EKSTRA","B"}
-
 def normalize_df(df: pd.DataFrame) -> pd.DataFrame:
-    """Bersihkan nama kolom + konversi numerik aman untuk kolom mapel."""
+    """Bersihkan nama kolom + konversi numerik aman untuk kolom mapel (tipe dipadatkan)."""
     out = df.copy()
     out.columns = [str(c).strip().upper() for c in out.columns]
     # Buang Unnamed
     out = out.loc[:, ~out.columns.astype(str).str.contains(r"^UNNAMED", na=False)]
-    # Konversi numerik aman untuk kolom mapel
-    for c in out.columns:
-        if c not in META_COLS:
-            out[c] = pd.to_numeric(out[c], errors="coerce")
-    # TOTAL juga numeric kalau ada
-    if "TOTAL" in out.columns:
-        out["TOTAL"] = pd.to_numeric(out["TOTAL"], errors="coerce")
-    return out
+    # Konversi numerik aman untuk kolom mapel & total (peran dari nama kolom)
+    roles = schema.resolve(out.columns, [True] * out.shape[1])
+    for c in roles.cols(schema.MAPEL, schema.RINGKASAN):
+        out[c] = pd.to_numeric(out[c], errors="coerce")
+    return dtypes.compact_df(out)
 
 def detect_mapel_columns(df: pd.DataFrame):
-    """Deteksi kolom mapel dari dataset lebar (exclude kolom meta)."""
-    return [c for c in df.columns if c not in META_COLS]
+    """Kolom mapel dataset lebar (lihat utils/schema.py)."""
+    return schema.resolve_df(df).mapel
 
 def try_read_any(file):
-    """Baca CSV/XLS/XLSX dari UploadedFile atau path."""
-    name = getattr(file, "name", str(file)).lower()
-    if name.endswith(".csv"):
-        return pd.read_csv(file)
-    return pd.read_excel(file)
+    """Baca CSV/XLS/XLSX dari UploadedFile atau path (per potongan, tipe dipadatkan)."""
+    return ingest.read_any(file)
+
+# =========================
+# Dataset untuk view (proyeksi kolom)
+# =========================
+def _pakai_store():
+    # Dataset sesi = dataset tersimpan versi terbaru → boleh dibaca per kolom dari Parquet
+    versi = st.session_state.get("dataset_version")
+    return versi is not None and versi == dataset_store.get_version()
+
+def dataset_schema():
+    """{kolom: numerik?} dataset sesi; None jika belum ada dataset."""
+    if _pakai_store():
+        schema = dataset_store.get_schema()
+        if schema is not None:
+            return schema
+    df = st.session_state.get("dataset")
+    if df is None:
+        return None
+    return {c: pd.api.types.is_numeric_dtype(t) for c, t in df.dtypes.items()}
+
+def load_view_dataset(columns=None):
+    """Salinan dangkal dataset sesi (copy-on-write); columns → hanya kolom itu
+    (dibaca langsung dari Parquet bila bisa)."""
+    if _pakai_store():
+        df = dataset_store.load_dataset(columns)
+        if df is not None:
+            return df
+    df = st.session_state.get("dataset")
+    if df is None:
+        return None
+    if columns is not None:
+        return df[[c for c in columns if c in df.columns]]
+    return df.copy(deep=False)
+
+def dataset_roles():
+    """Skema kolom (peran tiap kolom) dataset sesi; None jika belum ada dataset."""
+    if _pakai_store():
+        roles = dataset_store.get_roles()
+        if roles is not None:
+            return roles
+    df = st.session_state.get("dataset")
+    return None if df is None else schema.resolve_df(df)
+
+def derived_data():
+    """Kolom mapel, rata-rata, total & flag lulus dataset sesi (sekali per versi dataset)."""
+    if _pakai_store():
+        versi = st.session_state["dataset_version"]
+        data = derived.for_version(versi, dataset_store.load_versioned, dataset_store.get_roles)
+        if data is not None:
+            return data
+    df = st.session_state.get("dataset")
+    return None if df is None else derived.compute(df)
+
+def derived_frame(columns=None):
+    """(data turunan, dataset sesi[columns]) dari versi dataset yang sama, sehingga
+    data.rata / data.lulus sejajar per baris dengan frame. (None, None) jika belum ada."""
+    if _pakai_store():
+        versi, df = dataset_store.load_versioned()
+        if df is not None:
+            data = derived.for_version(versi, lambda: (versi, df), dataset_store.get_roles)
+            return data, _kolom(df, columns)
+    df = st.session_state.get("dataset")
+    if df is None:
+        return None, None
+    return derived.compute(df), _kolom(df.copy(deep=False), columns)
+
+def _kolom(df, columns):
+    return df if columns is None else df[[c for c in columns if c in df.columns]]
+
+RAPOR_IDENTITAS = ["NIS", "NISN", "Nama", "Kelas"]
+
+def rapor_frame():
+    """Tabel rapor: identitas + kolom mapel + Rata-rata → (df, nama_asli).
+
+    Kolom identitas ditampilkan dengan nama kanonik; nama_asli = {nama tampil:
+    kolom tersimpan} untuk kolom yang diganti namanya (dipakai saat menyimpan
+    hasil edit). (None, {}) jika belum ada dataset.
+    """
+    data, df = derived_frame()
+    if data is None:
+        return None, {}
+    # Kolom yang ditampilkan saja; frame & Rata-rata dari versi yang sama
+    identitas = data.roles.rename_map(RAPOR_IDENTITAS)
+    df = _kolom(df, list(identitas) + data.nilai_cols).rename(columns=identitas)
+    df = df.loc[:, ~df.columns.duplicated()]
+    if data.rata is not None:
+        df = df.assign(**{"Rata-rata": data.rata.to_numpy()})
+    cols = [c for c in RAPOR_IDENTITAS if c in df.columns] + data.nilai_cols
+    if "Rata-rata" in df.columns:
+        cols.append("Rata-rata")
+    nama_asli = {k: c for c, k in data.roles.rename_map(RAPOR_IDENTITAS + ["Rata-rata"]).items() if c != k}
+    return df.loc[:, cols], nama_asli
 
 def df_download_button(df, filename="data.csv", label="💾 Download CSV"):
     """Tombol download DataFrame jadi CSV."""
@@ -0,0 +1,214 @@
+# utils/ingest.py
+# ==========================================================
+# Ingest dataset bertahap (streaming) untuk upload besar
+# - CSV dibaca per potongan (chunksize) sebagai teks (dtype=str), tanpa
+#   tebakan tipe per potongan
+# - XLSX dibaca per baris dengan openpyxl read_only, semua sheet
+#   (1 sheet per kelas → kolom Kelas diisi nama sheet)
+# - Normalisasi & validasi per potongan; kolom teks ditahan sebagai string
+#   arrow, lalu tipe dipadatkan SEKALI per kolom setelah digabung → hasil
+#   tidak bergantung pada batas potongan (mis. NISN 0071759177 tetap teks)
+# - Memori puncak ≈ dataset mentah (teks arrow) + dataset padat, saat
+#   pemadatan akhir
+# - Progres dilaporkan per potongan (untuk st.progress)
+# - Skema kolom (peran tiap kolom) diresolusi sekali setelah digabung
+# ==========================================================
+import os
+import hashlib
+import pandas as pd
+from utils import dtypes, schema
+
+CHUNK_ROWS = 50_000
+HASH_BLOCK = 1 << 20    # 1 MB per baca saat hashing
+
+# =========================
+# File
+# =========================
+def _nama(file) -> str:
+    return getattr(file, "name", str(file)).lower()
+
+def file_hash(file) -> str:
+    """SHA-1 isi file (UploadedFile / path) dibaca per blok, tanpa salinan penuh."""
+    h = hashlib.sha1()
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            for blok in iter(lambda: f.read(HASH_BLOCK), b""):
+                h.update(blok)
+        return h.hexdigest()
+    file.seek(0)
+    for blok in iter(lambda: file.read(HASH_BLOCK), b""):
+        h.update(blok)
+    file.seek(0)
+    return h.hexdigest()
+
+def _ukuran(f) -> int:
+    pos = f.tell()
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(pos)
+    return size or 1
+
+# =========================
+# Pembaca per potongan → (label, DataFrame mentah, progres 0..1)
+# =========================
+def _iter_csv(f, chunk_rows):
+    size = _ukuran(f)
+    for chunk in pd.read_csv(f, chunksize=chunk_rows, dtype=str):
+        yield "CSV", chunk, min(1.0, f.tell() / size)
+
+def _judul(header):
+    # Judul kosong → None (kolom dibuang); judul kembar → "X.1", "X.2" seperti pandas
+    out, seen = [], {}
+    for v in header:
+        nama = None if v is None or str(v).strip() == "" else str(v).strip()
+        if nama is not None and nama in seen:
+            seen[nama] += 1
+            nama = f"{nama}.{seen[nama]}"
+        elif nama is not None:
+            seen[nama] = 0
+        out.append(nama)
+    return out
+
+def _frame(rows, judul, kelas=None):
+    df = pd.DataFrame.from_records(rows)
+    df = df.iloc[:, :len(judul)]
+    df.columns = judul[:df.shape[1]]
+    df = df.loc[:, [c is not None for c in df.columns]]
+    if kelas is not None and "kelas" not in {str(c).lower() for c in df.columns}:
+        df["Kelas"] = kelas
+    return df
+
+def _iter_xlsx(f, chunk_rows):
+    from openpyxl import load_workbook
+    wb = load_workbook(f, read_only=True, data_only=True)
+    try:
+        sheets = wb.worksheets
+        multi = len(sheets) > 1
+        total = sum(ws.max_row or 0 for ws in sheets) or None
+        selesai = 0
+        for ws in sheets:
+            rows = ws.iter_rows(values_only=True)
+            judul = None
+            for row in rows:
+                selesai += 1
+                if row and any(v is not None for v in row):
+                    judul = _judul(row)
+                    break
+            if judul is None:
+                continue    # sheet kosong
+            kelas = ws.title if multi else None
+            buf = []
+            for row in rows:
+                selesai += 1
+                buf.append(row)
+                if len(buf) >= chunk_rows:
+                    yield ws.title, _frame(buf, judul, kelas), min(1.0, selesai / total) if total else 0.0
+                    buf = []
+            if buf:
+                yield ws.title, _frame(buf, judul, kelas), min(1.0, selesai / total) if total else 0.0
+    finally:
+        wb.close()
+
+def read_chunks(file, chunk_rows=CHUNK_ROWS):
+    """Generator (label, DataFrame mentah, progres) untuk CSV / XLSX / XLS."""
+    nama = _nama(file)
+    buka = isinstance(file, (str, os.PathLike))
+    f = open(file, "rb") if buka else file
+    try:
+        if not buka:
+            f.seek(0)
+        if nama.endswith(".csv"):
+            yield from _iter_csv(f, chunk_rows)
+        elif nama.endswith(".xls"):
+            # Format lama (xlrd) tidak bisa dibaca per baris → 1 potongan
+            yield "XLS", pd.read_excel(f), 1.0
+        else:
+            yield from _iter_xlsx(f, chunk_rows)
+    finally:
+        if buka:
+            f.close()
+
+# =========================
+# Gabung potongan mentah
+# =========================
+def _mentah(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Kolom object → string arrow (hemat memori sampai dipadatkan); angka dari
+    XLSX tetap angka. Belum ada keputusan tipe per potongan."""
+    out = chunk.copy(deep=False)
+    for i, dtype in enumerate(out.dtypes):
+        if dtype == object:
+            out.isetitem(i, out.iloc[:, i].astype(dtypes.STRING_DTYPE))
+    return out
+
+def gabung(frames) -> pd.DataFrame:
+    """Concat potongan mentah lalu padatkan tipe sekali per kolom (compact_df)."""
+    frames = [f for f in frames if f.shape[1]]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return dtypes.compact_df(frames[0])
+    cols = list(dict.fromkeys(c for f in frames for c in f.columns))
+    for c in cols:
+        # Kolom yang seluruhnya NA di sebagian potongan → tipe disamakan dengan potongan
+        # yang berisi (pandas akan berhenti mengabaikan bagian all-NA saat menentukan tipe)
+        ada = [i for i, f in enumerate(frames) if c in f.columns]
+        kosong = [i for i in ada if not frames[i][c].notna().any()]
+        if not kosong or len(kosong) == len(ada):
+            continue
+        target = next(frames[i][c].dtype for i in ada if i not in kosong)
+        for i in kosong:
+            f = frames[i].copy(deep=False)
+            try:
+                f[c] = f[c].astype(target)
+            except (TypeError, ValueError):
+                f[c] = f[c].astype("float64")     # bilangan bulat tidak bisa menampung NA
+            frames[i] = f
+    out = pd.concat(frames, ignore_index=True)[cols]
+    return dtypes.compact_df(out)
+
+# =========================
+# Ingest
+# =========================
+def ingest(file, normalize=None, chunk_rows=CHUNK_ROWS, progress=None):
+    """Baca file per potongan → (DataFrame padat, info).
+
+    normalize(df) dipanggil per potongan (mis. app.normalize_dataset).
+    progress(fraksi, teks) dipanggil tiap potongan selesai.
+    info: rows, chunks, sheets, empty_rows (baris kosong dibuang),
+    raw_bytes (memori mentah per potongan dijumlah), bytes (hasil),
+    schema (schema.Schema, disimpan bersama dataset).
+    ValueError jika file tidak punya header atau tidak berisi data.
+    """
+    frames, sheets = [], []
+    info = {"rows": 0, "chunks": 0, "empty_rows": 0, "raw_bytes": 0}
+    for label, chunk, fraksi in read_chunks(file, chunk_rows):
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        if normalize is not None:
+            chunk = normalize(chunk)
+        chunk = chunk.loc[:, ~chunk.columns.duplicated()]
+        # Validasi: baris yang seluruhnya kosong dibuang
+        isi = chunk.notna().any(axis=1)
+        info["empty_rows"] += int((~isi).sum())
+        chunk = chunk[isi]
+        info["raw_bytes"] += dtypes.memory_bytes(chunk)
+        frames.append(_mentah(chunk))
+        info["rows"] += len(chunk)
+        info["chunks"] += 1
+        if label not in sheets:
+            sheets.append(label)
+        if progress is not None:
+            progress(fraksi, f"📥 {label}: {info['rows']:,} baris dibaca")
+    if not frames or not any(f.shape[1] for f in frames):
+        raise ValueError("File tidak memiliki header kolom.")
+    # Index 0..n-1 (baris kosong dibuang; lookup memakai posisi baris)
+    df = gabung(frames).reset_index(drop=True)
+    if df.empty:
+        raise ValueError("File tidak berisi data.")
+    info["sheets"] = sheets
+    info["bytes"] = dtypes.memory_bytes(df)
+    info["schema"] = schema.resolve_df(df)
+    return df, info
+
+def read_any(file, normalize=None):
+    """Seperti ingest() tanpa progres; hanya DataFrame padat."""
+    return ingest(file, normalize)[0]
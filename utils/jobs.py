@@ -0,0 +1,208 @@
+# utils/jobs.py
+# ==========================================================
+# Antrean job latar belakang (training, evaluasi, PDF massal)
+# - Job dijalankan di thread pool → skrip Streamlit tidak menunggu
+#   (pekerjaan CPU di dalam job tetap boleh memakai utils/workers)
+# - Store bersama per proses: status/progres dibaca ulang tiap rerun,
+#   hasil diambil sesi mana pun lewat id atau key job
+# - Pembatalan kooperatif: job.progress() / job.check() melempar
+#   JobCancelled setelah cancel() dipanggil
+# - Job bersama (key sama) mencatat sesi yang menunggu (owners);
+#   release() hanya membatalkan jika tidak ada sesi lain yang menunggu
+# ==========================================================
+import time
+import uuid
+import atexit
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from utils import profiling
+
+JOB_WORKERS = 2         # job yang berjalan bersamaan
+MAX_JOBS = 50           # job selesai yang disimpan (yang lama dibuang)
+
+ANTRE = "antre"
+BERJALAN = "berjalan"
+SELESAI = "selesai"
+GAGAL = "gagal"
+DIBATALKAN = "dibatalkan"
+AKTIF = {ANTRE, BERJALAN}
+
+class JobCancelled(Exception):
+    """Dilempar di dalam job yang dibatalkan."""
+
+class Job:
+    """Satu pekerjaan latar belakang. fn(job) → hasil."""
+
+    def __init__(self, kind, fn, key=None, label=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.key = key
+        self.label = label or kind
+        self.fn = fn
+        self.status = ANTRE
+        self.fraction = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.owners = set()     # sesi yang menunggu hasil job ini
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def done(self):
+        return self.status not in AKTIF
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        """Titik pembatalan: lempar JobCancelled jika cancel() sudah dipanggil."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def progress(self, selesai, total=None, message=None):
+        """Update progres (0..1, atau selesai/total) sekaligus titik pembatalan."""
+        self.fraction = min(1.0, selesai / total) if total else float(selesai)
+        if message is not None:
+            self.message = message
+        self.check()
+
+    def cancel(self):
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            # Belum sempat jalan → langsung dibatalkan
+            self.status = DIBATALKAN
+            self.finished = time.time()
+
+    def _run(self):
+        if self._cancel.is_set():
+            self.status, self.finished = DIBATALKAN, time.time()
+            return
+        self.status, self.started = BERJALAN, time.time()
+        try:
+            with profiling.stage(f"job.{self.kind}"):
+                result = self.fn(self)
+            self.check()
+            self.result, self.fraction, self.status = result, 1.0, SELESAI
+        except JobCancelled:
+            self.status = DIBATALKAN
+        except Exception as e:
+            self.error, self.status = f"{type(e).__name__}: {e}", GAGAL
+        finally:
+            self.finished = time.time()
+            self.fn = None      # lepas closure (data training) setelah selesai
+
+# =========================
+# Store + executor (per proses)
+# =========================
+_jobs = OrderedDict()
+_lock = threading.Lock()
+_executor = None
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+    return _executor
+
+def _evict():
+    # Buang job selesai paling lama jika melebihi MAX_JOBS
+    selesai = [j.id for j in _jobs.values() if j.done]
+    for jid in selesai[:max(0, len(_jobs) - MAX_JOBS)]:
+        del _jobs[jid]
+
+def submit(kind, fn, key=None, label=None, owner=None) -> Job:
+    """Masukkan job ke antrean. Job aktif/sukses dengan key sama dipakai ulang.
+
+    owner: id sesi yang menunggu hasilnya (lihat release()).
+    """
+    with _lock:
+        if key is not None:
+            for job in reversed(_jobs.values()):
+                if job.key == key and job.status in AKTIF | {SELESAI}:
+                    if owner is not None:
+                        job.owners.add(owner)
+                    return job
+        job = Job(kind, fn, key, label)
+        if owner is not None:
+            job.owners.add(owner)
+        _jobs[job.id] = job
+        _evict()
+        job._future = _get_executor().submit(job._run)
+        return job
+
+def get(job_id):
+    with _lock:
+        return _jobs.get(job_id)
+
+def find(key):
+    """Job terbaru dengan key tertentu (atau None)."""
+    with _lock:
+        for job in reversed(_jobs.values()):
+            if job.key == key:
+                return job
+    return None
+
+def cancel(job_id):
+    job = get(job_id)
+    if job is not None:
+        job.cancel()
+    return job
+
+def watch(job_id, owner):
+    """Catat sesi `owner` sebagai penunggu job yang sudah ada."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            job.owners.add(owner)
+        return job
+
+def release(job_id, owner):
+    """Sesi `owner` tidak lagi menunggu job ini; dibatalkan jika tak ada sesi lain yang menunggu."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        job.owners.discard(owner)
+        batal = not job.owners and not job.done
+    if batal:
+        job.cancel()
+    return job
+
+def forget(job_id):
+    """Hapus job selesai dari store (mis. untuk mencoba ulang yang gagal)."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None and job.done:
+            del _jobs[job_id]
+
+def list_jobs() -> pd.DataFrame:
+    """Ringkasan semua job (terbaru di atas) untuk panel admin."""
+    now = time.time()
+    with _lock:
+        rows = [{
+            "ID": j.id,
+            "Jenis": j.kind,
+            "Label": j.label,
+            "Status": j.status,
+            "Progres": round(j.fraction * 100),
+            "Pesan": j.error or j.message,
+            "Durasi (s)": round(((j.finished or now) - j.started), 2) if j.started else None,
+        } for j in reversed(_jobs.values())]
+    return pd.DataFrame(rows, columns=["ID", "Jenis", "Label", "Status", "Progres", "Pesan", "Durasi (s)"])
+
+def shutdown():
+    global _executor
+    with _lock:
+        for job in _jobs.values():
+            job._cancel.set()
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+atexit.register(shutdown)
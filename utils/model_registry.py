@@ -0,0 +1,131 @@
+# utils/model_registry.py
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+MODEL_DIR = os.path.join("data", "models")   # 1 file per model: {key}.pkl (tidak di-commit)
+MAX_MODELS = 16                  # jumlah model maksimum di registry
+MAX_BYTES = 64 * 1024 * 1024     # batas ukuran total (byte)
+
+# =========================
+# Key model
+# =========================
+def model_key(X: pd.DataFrame, y: pd.Series, threshold) -> str:
+    """Key = hash isi dataset (fitur + target) + nama kolom fitur + threshold."""
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(X, index=False).values.tobytes())
+    h.update(pd.util.hash_pandas_object(y, index=False).values.tobytes())
+    h.update("|".join(map(str, X.columns)).encode("utf-8"))
+    h.update(str(threshold).encode("utf-8"))
+    return h.hexdigest()
+
+# =========================
+# Registry (LRU + persist ke disk)
+# =========================
+class ModelRegistry:
+    """Simpan model terlatih per key, LRU dengan batas jumlah & ukuran.
+
+    Tiap model persist ke file sendiri di `path` ({key}.pkl): put hanya menulis
+    model itu, model lain tidak ditulis ulang. Urutan LRU antar restart dari
+    mtime file; isi file baru dibaca saat model diminta.
+    """
+
+    def __init__(self, path=MODEL_DIR, max_models=MAX_MODELS, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = self._scan()
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.pkl")
+
+    def _scan(self):
+        """{key: {"size"}} dari file di disk, urut terlama → terbaru dipakai."""
+        try:
+            files = [e for e in os.scandir(self.path) if e.is_file() and e.name.endswith(".pkl")]
+        except OSError:
+            return OrderedDict()   # folder belum ada → mulai kosong
+        files.sort(key=lambda e: e.stat().st_mtime)
+        return OrderedDict((e.name[:-4], {"size": e.stat().st_size}) for e in files)
+
+    def _write(self, key, data):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = f"{self._file(key)}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._file(key))
+
+    def _remove(self, key):
+        try:
+            os.remove(self._file(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        total = sum(e["size"] for e in self._entries.values())
+        while self._entries and (len(self._entries) > self.max_models or total > self.max_bytes):
+            key, old = self._entries.popitem(last=False)
+            total -= old["size"]
+            self._remove(key)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            if "model" not in entry:
+                # Model dari sesi proses sebelumnya → baca file sekali
+                try:
+                    with open(self._file(key), "rb") as f:
+                        entry["model"], entry["eval_df"] = pickle.load(f)
+                except Exception:
+                    del self._entries[key]     # file hilang / rusak → latih ulang
+                    return None
+            try:
+                os.utime(self._file(key))      # urutan LRU bertahan setelah restart
+            except OSError:
+                pass
+            return entry["model"], entry["eval_df"]
+
+    def put(self, key, model, eval_df):
+        data = pickle.dumps((model, eval_df), protocol=pickle.HIGHEST_PROTOCOL)
+        entry = {"model": model, "eval_df": eval_df, "size": len(data)}
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            try:
+                self._write(key, data)
+            except OSError:
+                pass  # gagal tulis disk → tetap jalan dengan cache memori
+            self._evict()
+
+    def get_or_train(self, key, train_fn):
+        """Ambil dari registry, atau latih via train_fn() → (model, eval_df) lalu simpan."""
+        hit = self.get(key)
+        if hit is not None:
+            return hit
+        model, eval_df = train_fn()
+        self.put(key, model, eval_df)
+        return model, eval_df
+
+    def clear(self):
+        with self._lock:
+            for key in self._entries:
+                self._remove(key)
+            self._entries.clear()
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> ModelRegistry:
+    """Registry tunggal per proses (dipakai bersama semua sesi)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -0,0 +1,53 @@
+# utils/pdf_cache.py
+# ==========================================================
+# Cache PDF berbasis hash konten (LRU, dibatasi jumlah & ukuran)
+# ==========================================================
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+MAX_ITEMS = 32
+MAX_BYTES = 128 * 1024 * 1024
+
+def frame_key(df: pd.DataFrame, *extra) -> str:
+    """Hash isi tabel + nama kolom + parameter lain (judul, threshold, ...)."""
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    h.update("|".join(map(str, df.columns)).encode("utf-8"))
+    for e in extra:
+        h.update(b"\x00" + str(e).encode("utf-8"))
+    return h.hexdigest()
+
+class PdfCache:
+    def __init__(self, max_items=MAX_ITEMS, max_bytes=MAX_BYTES):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data: bytes):
+        data = bytes(data)
+        with self._lock:
+            if key in self._items:
+                self._size -= len(self._items.pop(key))
+            self._items[key] = data
+            self._size += len(data)
+            while self._items and (len(self._items) > self.max_items or self._size > self.max_bytes):
+                _, old = self._items.popitem(last=False)
+                self._size -= len(old)
+        return data
+
+    def get_or_build(self, key, build_fn):
+        data = self.get(key)
+        if data is None:
+            data = self.put(key, build_fn())
+        return data
@@ -0,0 +1,126 @@
+# utils/pdf_table.py
+# ==========================================================
+# Renderer tabel PDF (fpdf2) untuk tabel panjang
+# - Semua sel diubah ke teks & diukur sekali (per nilai unik)
+# - Tinggi baris & titik pindah halaman dihitung di muka
+# - Header diulang di setiap halaman
+# - Teks digambar dengan pdf.text + garis grid per halaman
+#   (tanpa pdf.cell per sel → ±4x lebih cepat, linear terhadap baris)
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+def _teks(df: pd.DataFrame) -> pd.DataFrame:
+    """Semua sel → str (sama dengan str(nilai) per sel)."""
+    return pd.DataFrame(
+        {i: df.iloc[:, i].astype(str).to_numpy(dtype=object) for i in range(df.shape[1])}
+    )
+
+def _ukur(pdf, kolom, lebar, line_h, wrap):
+    """Per kolom: {teks: [baris...]} + lebar tiap baris; diukur sekali per nilai unik."""
+    maks = lebar - 2 * pdf.c_margin
+    pecahan, lebar_teks = {}, {}
+    for t in pd.unique(kolom):
+        w = pdf.get_string_width(t)
+        if wrap and w > maks:
+            lines = pdf.multi_cell(lebar, line_h, t, dry_run=True, output="LINES") or [""]
+            pecahan[t] = lines
+            for line in lines:
+                lebar_teks[line] = pdf.get_string_width(line)
+        else:
+            pecahan[t] = [t]
+            lebar_teks[t] = w
+    return pecahan, lebar_teks
+
+def _x_teks(x, w, sw, align, c_margin):
+    if align == "C":
+        return x + (w - sw) / 2
+    if align == "R":
+        return x + w - c_margin - sw
+    return x + c_margin
+
+def _gambar_baris(pdf, y, xs, widths, sel, lebar_teks, align, line_h):
+    # Baseline seperti pdf.cell: tengah tinggi baris + 0.3 × ukuran font
+    dy = 0.5 * line_h + 0.3 * pdf.font_size
+    for c, lines in enumerate(sel):
+        for k, line in enumerate(lines):
+            if line:
+                pdf.text(_x_teks(xs[c], widths[c], lebar_teks[c][line], align[c], pdf.c_margin), y + k * line_h + dy, line)
+
+def _grid(pdf, x0, xs_akhir, ys):
+    # Garis horizontal per batas baris + vertikal per batas kolom (1 halaman)
+    for y in ys:
+        pdf.line(x0, y, xs_akhir[-1], y)
+    for x in [x0] + xs_akhir:
+        pdf.line(x, ys[0], x, ys[-1])
+
+def render_table(pdf, df: pd.DataFrame, widths, line_h=6, header_h=8, size=9,
+                 header_size=None, align="C", header_align="C", wrap=True):
+    """Gambar df sebagai tabel mulai posisi pdf.y; header diulang tiap halaman.
+
+    widths: lebar kolom (mm). align: "L"/"C"/"R" atau list per kolom.
+    Teks yang lebih lebar dari kolom dipecah ke beberapa baris (wrap=True).
+    """
+    widths = [float(w) for w in widths]
+    n_col = len(widths)
+    align = [align] * n_col if isinstance(align, str) else list(align)
+    family, style, size_awal = pdf.font_family, pdf.font_style, pdf.font_size_pt
+    header_size = header_size or size
+    x0 = pdf.l_margin
+    xs = list(x0 + np.concatenate([[0.0], np.cumsum(widths)[:-1]]))
+    xs_akhir = list(x0 + np.cumsum(widths))
+
+    # Header: diukur sekali, dipakai di setiap halaman
+    pdf.set_font(family, "B", header_size)
+    judul = [str(c) for c in df.columns]
+    hdr = [_ukur(pdf, np.array([t], dtype=object), widths[c], line_h, wrap) for c, t in enumerate(judul)]
+    hdr_sel = [hdr[c][0][t] for c, t in enumerate(judul)]
+    hdr_lebar = [hdr[c][1] for c in range(n_col)]
+    hdr_h = max(header_h, line_h * max(len(s) for s in hdr_sel)) if n_col else header_h
+    hdr_line_h = hdr_h if all(len(s) == 1 for s in hdr_sel) else line_h
+
+    # Isi: teks + pecahan baris per nilai unik (font isi)
+    pdf.set_font(family, "", size)
+    teks = _teks(df)
+    ukur = [_ukur(pdf, teks[c].to_numpy(), widths[c], line_h, wrap) for c in range(n_col)]
+    pecahan = [u[0] for u in ukur]
+    lebar_teks = [u[1] for u in ukur]
+    n_baris = np.ones(len(teks), dtype="int64")
+    for c in range(n_col):
+        n_baris = np.maximum(n_baris, teks[c].map({t: len(p) for t, p in pecahan[c].items()}).to_numpy())
+    tinggi = line_h * n_baris
+
+    # Titik pindah halaman: 1 lintasan atas tinggi baris
+    batas = pdf.page_break_trigger
+    awal = pdf.y
+    if len(tinggi) and awal + hdr_h + tinggi[0] > batas:
+        pdf.add_page()
+        awal = pdf.y
+    top = pdf.t_margin
+    segmen, mulai, y = [], 0, awal + hdr_h
+    for i, h in enumerate(tinggi):
+        if y + h > batas and i > mulai:
+            segmen.append((mulai, i))
+            mulai, y = i, top + hdr_h
+        y += h
+    segmen.append((mulai, len(tinggi)))
+
+    baris = list(teks.itertuples(index=False, name=None))
+    for s, (a, b) in enumerate(segmen):
+        if s > 0:
+            pdf.add_page()
+        y = pdf.y if s > 0 else awal
+        ys = [y]
+        pdf.set_font(family, "B", header_size)
+        _gambar_baris(pdf, y, xs, widths, hdr_sel, hdr_lebar, [header_align] * n_col, hdr_line_h)
+        y += hdr_h
+        ys.append(y)
+        pdf.set_font(family, "", size)
+        for r in range(a, b):
+            sel = [pecahan[c][t] for c, t in enumerate(baris[r])]
+            _gambar_baris(pdf, y, xs, widths, sel, lebar_teks, align, line_h)
+            y += tinggi[r]
+            ys.append(y)
+        _grid(pdf, x0, xs_akhir, ys)
+        pdf.set_xy(x0, y)
+    pdf.set_font(family, style, size_awal)
@@ -0,0 +1,145 @@
+# utils/pdf_templates.py
+# ==========================================================
+# Bagian bersama PDF (fpdf2) untuk surat hasil prediksi & rapor
+# - Dokumen baru, font & output bytes
+# - Lebar kolom tabel dari panjang teks per kolom (bukan per sel)
+# - Font core "helvetica" + new_x/new_y: tanpa jalur deprecation fpdf2
+#   (Arial & ln=1 memicu warning + inspeksi stack di tiap pemanggilan)
+# - Surat per siswa: tata letak (posisi judul & tiap baris) disiapkan
+#   sekali, lalu tiap surat hanya menulis teks di posisi jadi (pdf.text),
+#   tanpa perhitungan cell per baris
+# ==========================================================
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+FONT = "helvetica"                                   # = Arial pada font core PDF
+NEXT = {"new_x": XPos.LMARGIN, "new_y": YPos.NEXT}   # pengganti ln=1
+RIGHT = {"new_x": XPos.RIGHT, "new_y": YPos.TOP}     # pengganti ln=0
+
+# =========================
+# Dokumen
+# =========================
+def new_pdf(orientation="P", size=12, style="") -> FPDF:
+    """FPDF A4 (mm) dengan 1 halaman & font awal sudah diset."""
+    pdf = FPDF(orientation, "mm", "A4")
+    pdf.add_page()
+    pdf.set_font(FONT, style, size)
+    return pdf
+
+def to_bytes(pdf: FPDF) -> bytes:
+    return bytes(pdf.output())
+
+# =========================
+# Tata letak kolom
+# =========================
+def _max_len(s: pd.Series) -> int:
+    """len(str(x)) terpanjang dalam kolom, tanpa memformat tiap sel jika tidak perlu."""
+    if isinstance(s.dtype, np.dtype):
+        arr = s.to_numpy()
+        if arr.dtype.kind in "iu":
+            # Bilangan bulat: cukup nilai min & maks (tanda minus ikut dihitung)
+            return max(len(str(arr.min())), len(str(arr.max())))
+        if arr.dtype.kind == "f":
+            return int(np.char.str_len(arr.astype(str)).max())
+        if arr.dtype.kind == "b":
+            return 5
+        return max(len(str(x)) for x in arr)
+    kosong = 4 if s.hasnans else 0           # str(NaN / NA) → 'nan' / '<NA>'
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        # Ukur tiap kategori yang dipakai sekali, bukan tiap baris
+        kode = np.unique(s.cat.codes.to_numpy())
+        panjang = s.cat.categories.astype(str).str.len().to_numpy()[kode[kode >= 0]]
+        return max(kosong, int(panjang.max()) if len(panjang) else 0)
+    if pd.api.types.is_string_dtype(s):
+        return max(kosong, int(s.str.len().max(skipna=True) or 0))
+    return int(s.astype(str).str.len().max())
+
+def text_lengths(df: pd.DataFrame) -> np.ndarray:
+    """Panjang teks terpanjang per kolom (termasuk judul kolom)."""
+    header = np.array([len(str(c)) for c in df.columns], dtype="int64")
+    if df.empty:
+        return header
+    isi = np.array([_max_len(df.iloc[:, i]) for i in range(df.shape[1])], dtype="int64")
+    return np.maximum(isi, header)
+
+def proportional_widths(lengths, total_width, min_w=20, max_w=50):
+    """Lebar kolom sebanding panjang teks, dibatasi [min_w, max_w] mm."""
+    lengths = np.asarray(lengths, dtype="float64")
+    total = lengths.sum() or 1.0
+    return np.clip(total_width * lengths / total, min_w, max_w).tolist()
+
+@lru_cache(maxsize=64)
+def fixed_widths(columns, total_width, fixed, min_w=15):
+    """Lebar kolom: kolom di `fixed` (tuple (nama_lower, mm)) tetap, sisanya berbagi rata.
+
+    Tabel sempit (tanpa kolom sisa) → kolom tetap diskalakan memenuhi lebar;
+    kolom tetap terlalu lebar → diperkecil supaya tiap kolom sisa >= min_w.
+    Di-cache per susunan kolom.
+    """
+    fixed = dict(fixed)
+    tetap = [fixed.get(str(c).strip().lower()) for c in columns]
+    n_sisa = sum(w is None for w in tetap)
+    total_tetap = sum(w for w in tetap if w is not None)
+    if n_sisa == 0:
+        skala = total_width / total_tetap if total_tetap else 1.0
+    else:
+        skala = min(1.0, max(0.0, total_width - min_w * n_sisa) / total_tetap) if total_tetap else 1.0
+    lebar_sisa = (total_width - total_tetap * skala) / n_sisa if n_sisa else 0.0
+    return tuple(lebar_sisa if w is None else w * skala for w in tetap)
+
+# =========================
+# Surat hasil prediksi per siswa
+# =========================
+JUDUL_SURAT = "Hasil Prediksi Kelulusan"
+BARIS_SURAT = (
+    "Nama : {}", "NIS  : {}", "Rata-rata + Bonus : {:.2f}",
+    "Bonus Ekstra : {}", "Threshold    : {}", "Alpa         : {}",
+)
+HIJAU = (0, 128, 0)
+MERAH = (200, 0, 0)
+
+def _baseline(top, h, font_size):
+    # Posisi garis dasar teks seperti pdf.cell(…, h) (teks di tengah tinggi sel)
+    return top + 0.5 * h + 0.3 * font_size
+
+@lru_cache(maxsize=1)
+def _layout_surat():
+    """Posisi teks surat (mm), dihitung sekali: (x, (x, y) judul, y tiap baris isi,
+    {jumlah baris isi: (y status, y catatan)})."""
+    pdf = new_pdf("P", 16, "B")
+    lebar = pdf.w - pdf.l_margin - pdf.r_margin
+    judul = (pdf.l_margin + (lebar - pdf.get_string_width(JUDUL_SURAT)) / 2,
+             _baseline(pdf.t_margin, 10, pdf.font_size))
+    pdf.set_font(FONT, "", 12)
+    top = pdf.t_margin + 10 + 8                     # judul + ln(8)
+    baris = tuple(_baseline(top + 8 * i, 8, pdf.font_size) for i in range(len(BARIS_SURAT)))
+    status = {}
+    for n in (len(BARIS_SURAT) - 1, len(BARIS_SURAT)):   # tanpa / dengan Alpa
+        y = top + 8 * n + 4                         # + ln(4)
+        status[n] = (_baseline(y, 10, pdf.font_size), _baseline(y + 10, 10, pdf.font_size))
+    return pdf.l_margin + pdf.c_margin, judul, baris, status
+
+def render_surat(nama, nis, rata2, bonus, status, threshold, alpa=None) -> bytes:
+    """Surat hasil prediksi satu siswa (PDF bytes), di atas tata letak jadi."""
+    x, judul, baris, posisi_status = _layout_surat()
+    pdf = new_pdf("P", 16, "B")
+    pdf.text(*judul, JUDUL_SURAT)
+
+    pdf.set_font(FONT, "", 12)
+    isi = [nama, nis, rata2, bonus, threshold] + ([alpa] if alpa is not None else [])
+    for fmt, y, nilai in zip(BARIS_SURAT, baris, isi):
+        pdf.text(x, y, fmt.format(nilai))
+
+    y_status, y_catatan = posisi_status[len(isi)]
+    if status == 1:
+        pdf.set_text_color(*HIJAU)
+        pdf.text(x, y_status, "Anda dinyatakan LULUS!")
+    else:
+        pdf.set_text_color(*MERAH)
+        pdf.text(x, y_status, "Anda dinyatakan TIDAK LULUS!")
+        if alpa is not None and alpa > threshold:
+            pdf.text(x, y_catatan, "Catatan: Alpa melebihi batas, hubungi Guru BK dan wali kelas.")
+    return to_bytes(pdf)
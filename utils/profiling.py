@@ -0,0 +1,132 @@
+# utils/profiling.py
+# ==========================================================
+# Profiling ringan per tahap (load, train, chart, PDF, ...)
+# - Sampel disimpan di ring buffer dalam proses (deque maxlen)
+# - Ringkasan p50/p95 per tahap + ekspor format teks Prometheus
+# - Nonaktif (default) → stage() mengembalikan context kosong bersama,
+#   timed() hanya mengecek satu flag sebelum memanggil fungsi asli
+#
+# Aktifkan lewat env PROFILING=1, settings.json {"profiling": true},
+# atau tombol di panel Performa (admin).
+# ==========================================================
+import os
+import json
+import time
+import functools
+import threading
+from collections import deque
+from contextlib import nullcontext, contextmanager
+import numpy as np
+import pandas as pd
+
+SETTINGS_FILE = os.path.join("data", "settings.json")
+PROM_FILE = os.path.join("data", "metrics.prom")
+BUFFER_SIZE = 5000
+METRIC_NAME = "sistem_akademik_stage_seconds"
+
+_NOOP = nullcontext()
+_buffer = deque(maxlen=BUFFER_SIZE)     # (timestamp, tahap, detik)
+_lock = threading.Lock()
+
+def _enabled_default():
+    if os.environ.get("PROFILING", "").lower() in ("1", "true", "yes"):
+        return True
+    try:
+        with open(SETTINGS_FILE, encoding="utf-8") as f:
+            return bool(json.load(f).get("profiling", False))
+    except Exception:
+        return False
+
+_state = {"enabled": _enabled_default()}
+
+# =========================
+# Saklar
+# =========================
+def is_enabled() -> bool:
+    return _state["enabled"]
+
+def set_enabled(value: bool):
+    _state["enabled"] = bool(value)
+
+# =========================
+# Pengukuran
+# =========================
+def record(name, seconds):
+    with _lock:
+        _buffer.append((time.time(), name, seconds))
+
+@contextmanager
+def _measure(name):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - t0)
+
+def stage(name):
+    """Context manager: `with stage("prediksi.train"): ...`"""
+    if not _state["enabled"]:
+        return _NOOP
+    return _measure(name)
+
+def timed(name=None):
+    """Dekorator: catat durasi tiap pemanggilan fungsi."""
+    def deco(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _state["enabled"]:
+                return fn(*args, **kwargs)
+            with _measure(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+# =========================
+# Ringkasan & ekspor
+# =========================
+def samples() -> pd.DataFrame:
+    with _lock:
+        data = list(_buffer)
+    return pd.DataFrame(data, columns=["Waktu", "Tahap", "Detik"])
+
+def clear():
+    with _lock:
+        _buffer.clear()
+
+def summary() -> pd.DataFrame:
+    """Jumlah sampel, p50, p95, maks & total detik per tahap."""
+    df = samples()
+    if df.empty:
+        return pd.DataFrame(columns=["Tahap", "N", "p50", "p95", "Maks", "Total"])
+    rows = []
+    for tahap, s in df.groupby("Tahap", sort=True)["Detik"]:
+        v = s.to_numpy()
+        p50, p95 = np.percentile(v, [50, 95])
+        rows.append({"Tahap": tahap, "N": len(v), "p50": p50, "p95": p95,
+                     "Maks": v.max(), "Total": v.sum()})
+    return pd.DataFrame(rows).sort_values("Total", ascending=False, ignore_index=True)
+
+def to_prometheus() -> str:
+    """Teks exposition format Prometheus (tipe summary, quantile 0.5 & 0.95)."""
+    lines = [
+        f"# HELP {METRIC_NAME} Durasi tahap aplikasi (detik)",
+        f"# TYPE {METRIC_NAME} summary",
+    ]
+    for r in summary().itertuples(index=False):
+        label = r.Tahap.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'{METRIC_NAME}{{stage="{label}",quantile="0.5"}} {r.p50:.6f}')
+        lines.append(f'{METRIC_NAME}{{stage="{label}",quantile="0.95"}} {r.p95:.6f}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {r.Total:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {r.N}')
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path=PROM_FILE) -> str:
+    """Tulis file .prom (untuk node_exporter textfile collector); kembalikan path."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(to_prometheus())
+    os.replace(tmp, path)
+    return path
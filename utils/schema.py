@@ -0,0 +1,148 @@
+# utils/schema.py
+# ==========================================================
+# Skema kolom dataset: peran tiap kolom, diresolusi sekali per upload
+# - Nama kolom dicocokkan ke nama kanonik lewat tabel alias
+#   (huruf kecil, tanpa spasi/tanda baca: "B. Indonesia" → "bindonesia")
+# - Alias tambahan bisa diatur di data/settings.json:
+#   "schema_alias": {"Matematika Wajib": "MTK", "Nilai Ekskul": "EKSTRA"}
+# - Peran: identitas, mapel, absensi, ekstra, ringkasan, lainnya
+# - Disimpan bersama dataset (dataset_meta "schema") → view membaca
+#   skema jadi, tanpa memindai kolom di setiap render
+# ==========================================================
+import os
+import re
+import json
+import pandas as pd
+
+SETTINGS_FILE = os.path.join("data", "settings.json")
+
+IDENTITAS = "identitas"
+MAPEL = "mapel"
+ABSENSI = "absensi"
+EKSTRA = "ekstra"
+RINGKASAN = "ringkasan"     # Total / Rata-rata dari file (bukan nilai mapel)
+LAINNYA = "lainnya"
+
+# Nama kanonik → peran
+KANONIK = {
+    "NO": IDENTITAS, "NIS": IDENTITAS, "NISN": IDENTITAS,
+    "Nama": IDENTITAS, "Kelas": IDENTITAS, "Jurusan": IDENTITAS,
+    "MTK": MAPEL, "BINDO": MAPEL, "BINGGRIS": MAPEL, "IPA": MAPEL, "IPS": MAPEL,
+    "Sakit": ABSENSI, "Izin": ABSENSI, "Alpa": ABSENSI,
+    "EKSTRA": EKSTRA,
+    "Total": RINGKASAN, "Rata-rata": RINGKASAN,
+    "username": LAINNYA, "password": LAINNYA, "role": LAINNYA,
+}
+
+# Alias (sudah dinormalisasi, lihat _kunci) → nama kanonik
+ALIAS = {
+    "no": "NO", "nomor": "NO", "noabsen": "NO",
+    "nis": "NIS", "noinduk": "NIS", "nomorinduk": "NIS",
+    "nisn": "NISN",
+    "nama": "Nama", "namasiswa": "Nama", "namalengkap": "Nama",
+    "kelas": "Kelas", "rombel": "Kelas",
+    "jurusan": "Jurusan", "kompetensikeahlian": "Jurusan", "konsentrasikeahlian": "Jurusan",
+    "mtk": "MTK", "matematika": "MTK",
+    "bindo": "BINDO", "indo": "BINDO", "bindonesia": "BINDO", "bahasaindonesia": "BINDO",
+    "binggris": "BINGGRIS", "bing": "BINGGRIS", "inggris": "BINGGRIS", "bahasainggris": "BINGGRIS",
+    "ipa": "IPA", "ips": "IPS",
+    "sakit": "Sakit", "izin": "Izin", "ijin": "Izin",
+    "alpa": "Alpa", "alpha": "Alpa", "alfa": "Alpa",
+    "ekstra": "EKSTRA", "ekskul": "EKSTRA", "ekstrakurikuler": "EKSTRA",
+    "total": "Total", "jumlah": "Total",
+    "ratarata": "Rata-rata", "rerata": "Rata-rata",
+    "username": "username", "password": "password", "role": "role",
+}
+
+# Nama tampilan saat upload (setelah title-case), lihat app.normalize_dataset
+NAMA_TAMPIL = {
+    "Nis": "NIS", "Nisn": "NISN", "Mtk": "MTK", "Ppkn": "PPKN",
+    "B.Indonesia": "Indo", "B.Inggris": "Inggris",
+}
+
+def _kunci(nama) -> str:
+    return re.sub(r"[^0-9a-z]", "", str(nama).lower())
+
+def alias_table() -> dict:
+    """ALIAS bawaan + tambahan dari settings.json ("schema_alias")."""
+    tabel = dict(ALIAS)
+    try:
+        with open(SETTINGS_FILE, encoding="utf-8") as f:
+            tambahan = json.load(f).get("schema_alias", {})
+    except Exception:
+        tambahan = {}
+    for alias, kanonik in tambahan.items():
+        tabel[_kunci(alias)] = str(kanonik)
+    return tabel
+
+# =========================
+# Skema
+# =========================
+class Schema:
+    """Peran & nama kanonik tiap kolom ({kolom: {"role", "canonical"}}, urut kolom dataset)."""
+
+    def __init__(self, kolom):
+        self.kolom = dict(kolom)
+        self._kanonik = {}
+        for c, info in self.kolom.items():
+            kanonik = info["canonical"]
+            if kanonik is not None and (kanonik not in self._kanonik or c == kanonik):
+                self._kanonik[kanonik] = c      # nama persis menang, selain itu kolom pertama
+
+    def role(self, col):
+        info = self.kolom.get(col)
+        return info["role"] if info else None
+
+    def cols(self, *roles):
+        """Kolom dengan peran tertentu (urut kolom dataset)."""
+        return [c for c, info in self.kolom.items() if info["role"] in roles]
+
+    def col(self, canonical):
+        """Nama kolom asli untuk nama kanonik (None jika tidak ada)."""
+        return self._kanonik.get(canonical)
+
+    def rename_map(self, names):
+        """{kolom asli: nama kanonik} untuk nama kanonik yang ada di dataset."""
+        return {self._kanonik[k]: k for k in names if k in self._kanonik}
+
+    @property
+    def mapel(self):
+        return self.cols(MAPEL)
+
+    def frame(self) -> pd.DataFrame:
+        """Tabel skema untuk ditampilkan (Kolom, Peran, Kanonik)."""
+        return pd.DataFrame(
+            [(c, info["role"], info["canonical"]) for c, info in self.kolom.items()],
+            columns=["Kolom", "Peran", "Kanonik"]
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.kolom, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, teks):
+        return cls(json.loads(teks))
+
+def resolve(columns, numerik, alias=None) -> Schema:
+    """Skema dari daftar kolom + flag numerik per kolom.
+
+    Kolom tanpa alias: numerik → mapel, selain itu lainnya.
+    Alias ke nama kanonik di luar KANONIK (dari settings) diperlakukan sama.
+    Mapel yang tidak numerik (isi teks) → lainnya.
+    """
+    alias = alias_table() if alias is None else alias
+    kolom = {}
+    for c, num in zip(columns, numerik):
+        kanonik = alias.get(_kunci(c))
+        role = KANONIK.get(kanonik) or (MAPEL if num else LAINNYA)
+        if role == MAPEL and not num:
+            role = LAINNYA
+        kolom[str(c)] = {"role": role, "canonical": kanonik}
+    return Schema(kolom)
+
+def role_for(name, numerik=True, alias=None):
+    """Peran satu kolom dari namanya (aturan sama dengan resolve)."""
+    return resolve([name], [numerik], alias).role(str(name))
+
+def resolve_df(df: pd.DataFrame, alias=None) -> Schema:
+    return resolve(df.columns, [pd.api.types.is_numeric_dtype(t) for t in df.dtypes], alias)
@@ -0,0 +1,79 @@
+# utils/scoring.py
+# ==========================================================
+# Engine penilaian kelulusan (tanpa Streamlit, full vektor)
+# Rata-rata mapel + bonus ekstra → target lulus & keterangan
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+BONUS_EKSTRA = {"B": 60, "SB": 65}
+BATAS_ALPA = 5
+KETERANGAN_ALPA = "Hubungi guru BK dan wali kelas"
+
+# =========================
+# Fungsi dasar (array)
+# =========================
+def rata_rata(nilai) -> np.ndarray:
+    """Rata-rata per baris, NaN diabaikan (sama seperti DataFrame.mean)."""
+    arr = np.asarray(nilai, dtype="float64")
+    if arr.ndim == 1:
+        arr = arr[:, None]
+    isi = ~np.isnan(arr)
+    jumlah = np.where(isi, arr, 0.0).sum(axis=1)
+    n = isi.sum(axis=1)
+    return np.divide(jumlah, n, out=np.full(len(arr), np.nan), where=n > 0)
+
+def bonus_ekstra(ekstra) -> np.ndarray:
+    """Bonus nilai ekstrakurikuler: B=60, SB=65, lainnya 0."""
+    kode = pd.Series(np.asarray(ekstra, dtype=object)).astype(str).str.upper()
+    return kode.map(BONUS_EKSTRA).fillna(0).to_numpy(dtype="int64")
+
+def hitung_target(final, threshold, alpa=None):
+    """Target 1/0 dari nilai final; Alpa > BATAS_ALPA dipaksa tidak lulus."""
+    final = np.asarray(final, dtype="float64")
+    target = np.where(final >= threshold, 1, 0)
+    keterangan = np.full(len(final), "", dtype=object)
+    if alpa is not None:
+        lewat = np.asarray(pd.to_numeric(pd.Series(alpa), errors="coerce").to_numpy() > BATAS_ALPA)
+        target[lewat] = 0
+        keterangan[lewat] = KETERANGAN_ALPA
+    return target, keterangan
+
+def score_arrays(nilai, threshold, ekstra=None, alpa=None, rata=None) -> dict:
+    """Hitung semua kolom hasil dari array mentah (rata → pakai rata-rata yang sudah dihitung)."""
+    rata = rata_rata(nilai) if rata is None else np.asarray(rata, dtype="float64")
+    bonus = bonus_ekstra(ekstra) if ekstra is not None else np.zeros(len(rata), dtype="int64")
+    final = rata + bonus
+    target, keterangan = hitung_target(final, threshold, alpa)
+    return {
+        "Rata-rata": rata,
+        "Bonus_Ekstra": bonus,
+        "Rata-rata_Final": final,
+        "Target": target,
+        "Keterangan": keterangan,
+    }
+
+# =========================
+# API DataFrame
+# =========================
+def score_df(df: pd.DataFrame, nilai_cols, threshold, ekstra_col="EKSTRA", alpa_col="Alpa", rata=None) -> pd.DataFrame:
+    """Tambahkan kolom Rata-rata, Bonus_Ekstra, Rata-rata_Final, Target, Keterangan.
+
+    rata → rata-rata mapel per baris yang sudah dihitung (lihat utils/derived.py).
+    """
+    nilai = None
+    if rata is None:
+        nilai = df[list(nilai_cols)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64")
+    hasil = score_arrays(
+        nilai,
+        threshold,
+        ekstra=df[ekstra_col].to_numpy() if ekstra_col in df.columns else None,
+        alpa=df[alpa_col].to_numpy() if alpa_col in df.columns else None,
+        rata=rata,
+    )
+    # assign → frame baru (dengan copy-on-write, kolom lama tidak disalin)
+    return df.assign(**hasil)
+
+def score_batch(frames, nilai_cols, threshold, **kwargs):
+    """Skor banyak DataFrame sekaligus (mis. per kelas / per file)."""
+    return [score_df(f, nilai_cols, threshold, **kwargs) for f in frames]
@@ -0,0 +1,109 @@
+# utils/snapshot.py
+# ==========================================================
+# Snapshot dataset (pengganti backup CSV)
+# - Parquet + kompresi zstd (pyarrow)
+# - Nama file = hash konten → data identik hanya disimpan sekali
+# - Retensi: simpan N snapshot terbaru (data/settings.json)
+# ==========================================================
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+import pandas as pd
+
+from utils import dataset_store, dtypes
+
+SNAPSHOT_DIR = "backup"
+INDEX_FILE = os.path.join(SNAPSHOT_DIR, "index.json")
+SETTINGS_FILE = os.path.join("data", "settings.json")
+DEFAULT_RETENTION = 10
+
+_lock = threading.Lock()
+
+# =========================
+# Util
+# =========================
+def content_hash(df: pd.DataFrame) -> str:
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    h.update("|".join(map(str, df.columns)).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def get_retention() -> int:
+    """Jumlah snapshot yang disimpan (settings.json → backup_retention)."""
+    try:
+        with open(SETTINGS_FILE, encoding="utf-8") as f:
+            return max(1, int(json.load(f).get("backup_retention", DEFAULT_RETENTION)))
+    except Exception:
+        return DEFAULT_RETENTION
+
+def _path(h):
+    return os.path.join(SNAPSHOT_DIR, f"siswa_{h}.parquet")
+
+def _read_index():
+    try:
+        with open(INDEX_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return []
+
+def _write_index(entries):
+    tmp = f"{INDEX_FILE}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    os.replace(tmp, INDEX_FILE)
+
+def _to_parquet(df, path):
+    # zstd: snapshot jarang dibaca → utamakan ukuran file
+    dataset_store.write_parquet(df, path, compression="zstd")
+
+# =========================
+# API
+# =========================
+def create_snapshot(df: pd.DataFrame):
+    """Simpan snapshot; kembalikan (hash, baru_dibuat)."""
+    h = content_hash(df)
+    with _lock:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        entries = [e for e in _read_index() if os.path.exists(_path(e["hash"]))]
+        baru = not os.path.exists(_path(h))
+        if baru:
+            _to_parquet(df, _path(h))
+        entries = [e for e in entries if e["hash"] != h]
+        entries.append({
+            "hash": h,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "rows": len(df),
+            "bytes": os.path.getsize(_path(h)),
+        })
+        # Retensi: buang snapshot paling lama
+        keep = get_retention()
+        for old in entries[:-keep]:
+            try:
+                os.remove(_path(old["hash"]))
+            except OSError:
+                pass
+        _write_index(entries[-keep:])
+    return h, baru
+
+def list_snapshots():
+    """Daftar snapshot, terbaru di depan."""
+    return [e for e in reversed(_read_index()) if os.path.exists(_path(e["hash"]))]
+
+def load_snapshot(h) -> pd.DataFrame:
+    with dtypes.arrow_strings():
+        return pd.read_parquet(_path(h), engine="pyarrow")
+
+def restore_snapshot(h) -> int:
+    """Muat snapshot ke dataset; kembalikan versi dataset baru.
+
+    Dataset yang ditimpa di-snapshot dulu (seperti saat upload).
+    """
+    # Baca dulu: retensi create_snapshot bisa menghapus snapshot yang dipulihkan
+    # Snapshot lama (sebelum pemadatan tipe) ikut dipadatkan
+    df = dtypes.compact_df(load_snapshot(h))
+    lama = dataset_store.load_dataset()
+    if lama is not None:
+        create_snapshot(lama)
+    return dataset_store.save_dataset(df)
@@ -0,0 +1,149 @@
+# utils/training.py
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split, StratifiedKFold, KFold
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from utils import profiling, workers
+
+METRIK = ["Accuracy", "Precision", "Recall", "F1-Score"]
+N_FOLDS = 5
+PARTISI = ["Kelas", "Jurusan"]   # kolom yang bisa dipakai untuk model per partisi
+LABEL_SEMUA = "SEMUA"
+
+# =========================
+# Training + Evaluasi
+# =========================
+def bisa_dilatih(y: pd.Series) -> bool:
+    """Split 70/30 hanya bisa jika ada 2 kelas dan tiap kelas minimal 2 sampel."""
+    return y.nunique() > 1 and y.value_counts().min() >= 2
+
+def bisa_cv(y: pd.Series) -> bool:
+    """Cross-validation cukup butuh 2 kelas (kelas kecil tetap ikut dievaluasi)."""
+    return y.nunique() > 1
+
+def _skor(y_true, y_pred):
+    return [
+        accuracy_score(y_true, y_pred),
+        precision_score(y_true, y_pred, zero_division=0),
+        recall_score(y_true, y_pred, zero_division=0),
+        f1_score(y_true, y_pred, zero_division=0),
+    ]
+
+def train_evaluate(X: pd.DataFrame, y: pd.Series, random_state=42):
+    """Latih RandomForest (split 70/30) dan kembalikan (model, eval_df)."""
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.3, random_state=random_state, stratify=y
+    )
+    model = RandomForestClassifier(random_state=random_state)
+    with profiling.stage("train.fit"):
+        model.fit(X_train, y_train)
+
+    with profiling.stage("train.evaluate"):
+        y_pred = model.predict(X_test)
+        eval_df = pd.DataFrame({
+            "Metrik": METRIK,
+            "Skor": _skor(y_test, y_pred)
+        })
+    return model, eval_df
+
+# =========================
+# K-fold cross-validation (fold paralel)
+# =========================
+def _folds(y, k, random_state):
+    # Stratified jika tiap kelas punya >= 2 sampel; selain itu KFold biasa
+    counts = y.value_counts()
+    if counts.min() >= 2:
+        cv = StratifiedKFold(n_splits=max(2, min(k, counts.min())), shuffle=True, random_state=random_state)
+    else:
+        cv = KFold(n_splits=max(2, min(k, len(y))), shuffle=True, random_state=random_state)
+    return list(cv.split(np.zeros(len(y)), y))
+
+def _cv_task(args):
+    """Dijalankan di worker: 1 fold → skor, atau idx None → model final (semua data)."""
+    X, y, train_idx, test_idx, random_state = args
+    model = RandomForestClassifier(random_state=random_state, n_jobs=1)
+    if test_idx is None:
+        model.fit(X, y)
+        return model
+    model.fit(X.iloc[train_idx], y.iloc[train_idx])
+    return _skor(y.iloc[test_idx], model.predict(X.iloc[test_idx]))
+
+def cross_validate(X: pd.DataFrame, y: pd.Series, k=N_FOLDS, random_state=42, progress=None):
+    """K-fold CV paralel + model final dari seluruh data.
+
+    Kembalikan (model, eval_df) dengan kolom Metrik, Skor (rata-rata fold),
+    Std, dan Fold (jumlah fold yang dipakai). `progress(selesai, total)`
+    diteruskan ke workers.map_parallel.
+    """
+    folds = _folds(y, k, random_state)
+    tasks = [(X, y, tr, te, random_state) for tr, te in folds]
+    tasks.append((X, y, None, None, random_state))
+    with profiling.stage("train.cross_validate"):
+        *skor, model = workers.map_parallel(_cv_task, tasks, progress=progress)
+
+    skor = np.array(skor)
+    eval_df = pd.DataFrame({
+        "Metrik": METRIK,
+        "Skor": skor.mean(axis=0),
+        "Std": skor.std(axis=0, ddof=1) if len(skor) > 1 else np.zeros(len(METRIK)),
+        "Fold": len(skor),
+    })
+    return model, eval_df
+
+# =========================
+# Training per partisi (Kelas / Jurusan)
+# =========================
+def kolom_partisi(columns):
+    """Mapping nama partisi → nama kolom aktual di dataset (case-insensitive)."""
+    lower = {str(c).strip().lower(): c for c in columns}
+    return {p: lower[p.lower()] for p in PARTISI if p.lower() in lower}
+
+def _train_partisi(args):
+    """Dijalankan di worker: latih 1 partisi → (nama, n, model, y_test, y_pred)."""
+    nama, X, y, random_state = args
+    if len(y) < 4 or not bisa_dilatih(y):
+        return nama, len(y), None, None, None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.3, random_state=random_state, stratify=y
+    )
+    model = RandomForestClassifier(random_state=random_state, n_jobs=1)
+    model.fit(X_train, y_train)
+    return nama, len(y), model, y_test.to_numpy(), model.predict(X_test)
+
+def train_partitioned(X: pd.DataFrame, y: pd.Series, groups: pd.Series, random_state=42, progress=None):
+    """Satu RandomForest per partisi, dilatih paralel di process pool.
+
+    Kembalikan (models, eval_df):
+    - models: {partisi: model} (partisi yang datanya kurang dilewati)
+    - eval_df: Partisi, N, Accuracy..F1-Score, Status per partisi +
+      baris SEMUA (metrik dari gabungan prediksi semua partisi)
+    """
+    groups = groups.astype(object).fillna("-").astype(str).str.strip()
+    tasks = [(nama, X[idx], y[idx], random_state)
+             for nama, idx in ((g, (groups == g).to_numpy()) for g in sorted(groups.unique()))]
+    with profiling.stage("train.partitioned"):
+        hasil = workers.map_parallel(_train_partisi, tasks, progress=progress)
+
+    models, rows, semua_true, semua_pred = {}, [], [], []
+    for nama, n, model, y_test, y_pred in hasil:
+        if model is None:
+            rows.append([nama, n] + [np.nan] * len(METRIK) + ["Data kurang"])
+            continue
+        models[nama] = model
+        semua_true.append(y_test)
+        semua_pred.append(y_pred)
+        rows.append([nama, n] + _skor(y_test, y_pred) + ["OK"])
+
+    if semua_true:
+        skor = _skor(np.concatenate(semua_true), np.concatenate(semua_pred))
+        rows.append([LABEL_SEMUA, len(y)] + skor + [f"{len(models)} model"])
+    eval_df = pd.DataFrame(rows, columns=["Partisi", "N"] + METRIK + ["Status"])
+    return models, eval_df
+
+def ringkasan(eval_partisi: pd.DataFrame) -> pd.DataFrame:
+    """Baris SEMUA dari tabel per partisi → format Metrik/Skor (untuk grafik & PDF)."""
+    semua = eval_partisi[eval_partisi["Partisi"] == LABEL_SEMUA]
+    if semua.empty:
+        return pd.DataFrame()
+    return pd.DataFrame({"Metrik": METRIK, "Skor": semua.iloc[0][METRIK].astype(float).tolist()})
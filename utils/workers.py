@@ -0,0 +1,108 @@
+# utils/workers.py
+# ==========================================================
+# Process pool bersama untuk pekerjaan CPU berat (training, CV, ...)
+# - Satu pool per proses server, dibuat saat pertama dipakai
+# - Fallback ke eksekusi serial jika pool tidak bisa dipakai
+#   (1 core, lingkungan tanpa fork/spawn, pool rusak)
+# ==========================================================
+import os
+import atexit
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+MAX_WORKERS = os.cpu_count() or 1
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ProcessPoolExecutor:
+    """Pool bersama; dibuat sekali dan dipakai ulang antar request."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # forkserver: worker tidak mewarisi thread/koneksi milik server Streamlit
+            method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=mp.get_context(method))
+        return _pool
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+atexit.register(shutdown)
+
+def _serial(fn, items, progress):
+    hasil = []
+    for i, it in enumerate(items, 1):
+        hasil.append(fn(it))
+        if progress is not None:
+            progress(i, len(items))
+    return hasil
+
+def map_parallel(fn, items, min_items=2, progress=None):
+    """Jalankan fn(item) untuk tiap item; paralel jika item cukup & core > 1.
+
+    `fn` harus fungsi level modul (bisa di-pickle). Urutan hasil = urutan input.
+    `progress(selesai, total)` dipanggil tiap item selesai; exception dari
+    progress (mis. job dibatalkan) membatalkan item yang belum jalan.
+    """
+    items = list(items)
+    if MAX_WORKERS < 2 or len(items) < min_items:
+        return _serial(fn, items, progress)
+    try:
+        futures = [get_pool().submit(fn, it) for it in items]
+    except (BrokenProcessPool, OSError, RuntimeError):
+        # Pool rusak / tidak bisa membuat proses → ulang serial
+        shutdown()
+        return _serial(fn, items, progress)
+    try:
+        for i, _ in enumerate(as_completed(futures), 1):
+            if progress is not None:
+                progress(i, len(items))
+        return [f.result() for f in futures]
+    except BrokenProcessPool:
+        shutdown()
+        return _serial(fn, items, progress)
+    except BaseException:
+        for f in futures:
+            f.cancel()
+        raise
+
+def imap_unordered(fn, items, window=None):
+    """Generator fn(item) → hasil sesuai urutan selesai (bukan urutan input).
+
+    Paling banyak `window` item berjalan/tertahan sekaligus → hasil besar
+    (mis. PDF) bisa langsung ditulis lalu dibuang, tidak ditumpuk di memori.
+    """
+    items = list(items)
+    if MAX_WORKERS < 2 or len(items) < 2:
+        for it in items:
+            yield fn(it)
+        return
+    window = window or MAX_WORKERS * 2
+    try:
+        pool = get_pool()
+        pending = {pool.submit(fn, it) for it in items[:window]}
+    except (BrokenProcessPool, OSError, RuntimeError):
+        shutdown()
+        for it in items:
+            yield fn(it)
+        return
+    berikut = window
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                if berikut < len(items):
+                    pending.add(pool.submit(fn, items[berikut]))
+                    berikut += 1
+                yield f.result()
+    finally:
+        # Generator ditutup / error (mis. job dibatalkan) → batalkan sisa
+        for f in pending:
+            f.cancel()
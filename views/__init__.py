@@ -4,3 +4,4 @@ from . import data_guru
 from . import rapor
 from . import statistik
 from . import prediksi
+from . import performa
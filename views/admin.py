@@ -1,10 +1,11 @@
 import streamlit as st
 import sqlite3
+from utils import connection
 
 DB_FILE = "users.db"
 
 def init_db():
-    conn = sqlite3.connect(DB_FILE)
+    conn = connection.get_conn(DB_FILE)
     c = conn.cursor()
     # buat tabel kalau belum ada
     c.execute("""
@@ -25,15 +26,13 @@ def init_db():
         except Exception as e:
             print("Kolom role sudah ada atau gagal:", e)
 
-    conn.close()
-
 
 def show(df=None):
     st.title("👨‍💻 Manajemen Pengguna")
 
     # init database
     init_db()
-    conn = sqlite3.connect(DB_FILE)
+    conn = connection.get_conn(DB_FILE)
     c = conn.cursor()
 
     menu = ["Daftar User", "Tambah User"]
@@ -93,8 +92,7 @@ def show(df=None):
                     st.success(f"User {username} berhasil dibuat sebagai {role}.")
                     st.rerun()
                 except sqlite3.IntegrityError:
+                    conn.rollback()
                     st.error("⚠️ Username sudah ada, gunakan yang lain.")
             else:
                 st.error("Username dan password wajib diisi.")
-
-    conn.close()
@@ -2,7 +2,7 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-import sqlite3
+from utils import connection, assets, profiling, helpers, chart_data
 
 DB_FILE = "database.db"
 
@@ -48,18 +48,16 @@ def _profil_card(profil: dict):
 # Fetch Guru from DB
 # =========================
 def get_guru_count():
-    conn = sqlite3.connect(DB_FILE)
+    conn = connection.get_conn(DB_FILE)
     try:
-        df = pd.read_sql("SELECT * FROM guru", conn)
-        return len(df)
+        return conn.execute("SELECT COUNT(*) FROM guru").fetchone()[0]
     except Exception:
         return 0
-    finally:
-        conn.close()
 
 # =========================
 # Show Dashboard
 # =========================
+@profiling.timed("view.dashboard")
 def show():
     st.markdown("## 📊 Dashboard Prediksi Kelulusan Siswa")
     st.caption("Ringkasan cepat, profil sekolah, dan tren akademik.")
@@ -71,7 +69,7 @@ def show():
         if logo:
             st.image(logo, use_container_width=True)
         else:
-            st.image("assets/img/logo.png", use_container_width=True)
+            assets.image("logo.png")
     with c2:
         profil = st.session_state.get("profil_sekolah", {})
         _profil_card(profil)
@@ -79,24 +77,23 @@ def show():
     # =========================
     # Cek Dataset
     # =========================
-    if "dataset" not in st.session_state or st.session_state["dataset"] is None:
+    # Kolom mapel, rata-rata & flag lulus dihitung sekali per versi dataset
+    data, df = helpers.derived_frame()
+    if data is None:
         st.warning("⚠️ Belum ada dataset. Silakan upload file CSV/XLSX dulu.")
         return   # 🚪 keluar supaya grafik/KPI tidak dipanggil
 
-    df = st.session_state["dataset"].copy()
-
-    # Kolom nilai
-    exclude_cols = ["no","nis","nisn","sakit","izin","alpa"]
-    nilai_cols = [c for c in df.select_dtypes(include="number").columns if c.lower() not in exclude_cols]
-
-    if nilai_cols and "Rata-rata" not in df.columns:
-        df["Rata-rata"] = df[nilai_cols].mean(axis=1)
+    # Kolom teks untuk grafik; Rata-rata dari data turunan versi yang sama
+    kolom = data.roles.rename_map(["Nama", "Jurusan"])
+    df = df[list(kolom)].rename(columns=kolom)
+    if data.rata is not None:
+        df = df.assign(**{"Rata-rata": data.rata.to_numpy()})
 
     jumlah_siswa = len(df)
     jumlah_guru = get_guru_count()
-    rapor_terisi = df["Rata-rata"].count() if "Rata-rata" in df.columns else 0
+    rapor_terisi = int(data.rata.count()) if data.rata is not None else 0
     coverage = f"{round((rapor_terisi/len(df))*100,1)}%" if len(df)>0 else "0%"
-    lulus = df[df["Rata-rata"]>=70].shape[0] if "Rata-rata" in df.columns else 0
+    lulus = int(data.lulus.sum()) if data.lulus is not None else 0
     tingkat_lulus = f"{round((lulus/len(df))*100,1)}%" if len(df)>0 else "0%"
 
     # KPI Cards
@@ -111,16 +108,19 @@ def show():
     # Distribusi rata-rata
     if "Rata-rata" in df.columns:
         st.markdown("#### 📈 Distribusi Rata-rata Nilai Siswa")
-        chart = alt.Chart(df).mark_bar().encode(
-            x=alt.X("Rata-rata:Q", bin=alt.Bin(maxbins=20)),
-            y="count()"
+        # Bin dihitung di server → yang dikirim hanya ±20 baris
+        chart = alt.Chart(chart_data.histogram(df["Rata-rata"], maxbins=20)).mark_bar().encode(
+            x=alt.X("Mulai:Q", bin="binned", title="Rata-rata"),
+            x2="Akhir:Q",
+            y=alt.Y("Jumlah:Q", title="Jumlah"),
+            tooltip=["Mulai", "Akhir", "Jumlah"]
         ).properties(height=360)
         st.altair_chart(chart, use_container_width=True)
 
         # Top 10 rata-rata
         if "Nama" in df.columns:
             st.markdown("#### 🏆 10 Besar Rata-rata Nilai")
-            top10 = df.sort_values("Rata-rata", ascending=False).head(10)
+            top10 = chart_data.top_n(df, "Rata-rata", 10, [c for c in ["Nama", "Rata-rata", "Jurusan"] if c in df.columns])
             rank_chart = alt.Chart(top10).mark_bar().encode(
                 x="Rata-rata",
                 y=alt.Y("Nama", sort="-x"),
@@ -132,10 +132,10 @@ def show():
     # Distribusi Jurusan
     if "Jurusan" in df.columns:
         st.markdown("#### 🏫 Distribusi Siswa per Jurusan")
-        jurusan_chart = alt.Chart(df).mark_bar().encode(
+        jurusan_chart = alt.Chart(chart_data.counts(df["Jurusan"], "Jurusan")).mark_bar().encode(
             x="Jurusan",
-            y="count()",
+            y=alt.Y("Jumlah:Q"),
             color="Jurusan",
-            tooltip=["Jurusan","count()"]
+            tooltip=["Jurusan","Jumlah"]
         )
         st.altair_chart(jurusan_chart, use_container_width=True)
@@ -1,57 +1,47 @@
 # views/data_guru.py
 import streamlit as st
 import pandas as pd
-import sqlite3
+from utils import connection, profiling
 
 DB_FILE = "database.db"
 
 # =============================
 # DATABASE FUNCTIONS
 # =============================
+# Tulis lewat connection.transaction(): rollback saat error, jadi koneksi
+# bersama (per thread) tidak tertinggal di transaksi terbuka
 def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS guru (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nama TEXT NOT NULL,
-            mapel TEXT NOT NULL,
-            status TEXT NOT NULL
-        )
-    """)
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_FILE) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS guru (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nama TEXT NOT NULL,
+                mapel TEXT NOT NULL,
+                status TEXT NOT NULL
+            )
+        """)
 
 def tambah_guru(nama, mapel, status):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("INSERT INTO guru (nama, mapel, status) VALUES (?, ?, ?)", (nama, mapel, status))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_FILE) as conn:
+        conn.execute("INSERT INTO guru (nama, mapel, status) VALUES (?, ?, ?)", (nama, mapel, status))
 
 def get_guru():
-    conn = sqlite3.connect(DB_FILE)
+    conn = connection.get_conn(DB_FILE)
     df = pd.read_sql("SELECT * FROM guru", conn)
-    conn.close()
     return df
 
 def hapus_guru(guru_id):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("DELETE FROM guru WHERE id=?", (guru_id,))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_FILE) as conn:
+        conn.execute("DELETE FROM guru WHERE id=?", (guru_id,))
 
 def update_guru(guru_id, nama, mapel, status):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("UPDATE guru SET nama=?, mapel=?, status=? WHERE id=?", (nama, mapel, status, guru_id))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_FILE) as conn:
+        conn.execute("UPDATE guru SET nama=?, mapel=?, status=? WHERE id=?", (nama, mapel, status, guru_id))
 
 # =============================
 # STREAMLIT UI
 # =============================
+@profiling.timed("view.data_guru")
 def show():
     st.markdown("## 👩‍🏫 Manajemen Data Guru")
     init_db()
@@ -2,107 +2,129 @@
 import streamlit as st
 import sqlite3
 import pandas as pd
+from utils import connection, dataset_store, profiling
 
 DB_FILE = "database.db"
+SUMBER_DATASET = "dataset"      # baris dibuat sync_from_dataset (boleh dihapus saat sync)
+SUMBER_MANUAL = "manual"        # baris ditambah lewat form (tidak pernah dihapus sync)
 
 # =========================
 # DB Setup
 # =========================
 def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+    with connection.transaction(DB_FILE) as conn:
+        _buat_tabel(conn.cursor())
+
+def _buat_tabel(c):
     c.execute("""
         CREATE TABLE IF NOT EXISTS siswa_master (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nis TEXT UNIQUE,
             nama TEXT,
-            kelas TEXT
+            kelas TEXT,
+            sumber TEXT DEFAULT 'manual'
         )
     """)
-    conn.commit()
-    conn.close()
+    # DB lama tanpa kolom sumber → baris lama dianggap manual (tidak dihapus sync)
+    kolom = {r[1] for r in c.execute("PRAGMA table_info(siswa_master)")}
+    if "sumber" not in kolom:
+        c.execute("ALTER TABLE siswa_master ADD COLUMN sumber TEXT DEFAULT 'manual'")
 
 def get_all_siswa():
-    conn = sqlite3.connect(DB_FILE)
+    conn = connection.get_conn(DB_FILE)
     df = pd.read_sql_query("SELECT * FROM siswa_master ORDER BY kelas, nama", conn)
-    conn.close()
     return df
 
 def sync_from_dataset():
-    """Sinkronkan data siswa dari tabel 'siswa' (dataset nilai)"""
-    conn = sqlite3.connect(DB_FILE)
-    try:
-        df_dataset = pd.read_sql_query("SELECT * FROM siswa", conn)
-    except Exception:
-        conn.close()
-        return
+    """Sinkronkan siswa_master dengan dataset nilai yang tersimpan.
 
-    if df_dataset.empty:
-        conn.close()
+    Selisih dihitung sekali jalan dengan pandas (insert/update/delete per NIS),
+    lalu diterapkan dengan executemany dalam satu transaksi. Yang dihapus hanya
+    baris yang dulu dibuat sync (sumber = dataset); siswa tambahan manual tetap.
+    """
+    init_db()
+    conn = connection.get_conn(DB_FILE)
+    roles = dataset_store.get_roles()
+    if roles is None:
         return
 
-    # Ambil kolom utama
-    nis_col = next((c for c in df_dataset.columns if c.lower() == "nis"), None)
-    nama_col = next((c for c in df_dataset.columns if c.lower() == "nama"), None)
-    kelas_col = next((c for c in df_dataset.columns if "kelas" in c.lower()), None)
+    # Kolom utama dari skema kolom (alias: "No Induk" → NIS, "Rombel" → Kelas, ...)
+    nis_col, nama_col, kelas_col = roles.col("NIS"), roles.col("Nama"), roles.col("Kelas")
 
     if not nis_col or not nama_col:
-        conn.close()
         return
 
-    # Buat dataframe master
-    df_master = df_dataset[[nis_col, nama_col] + ([kelas_col] if kelas_col else [])].copy()
-    df_master.columns = ["nis", "nama"] + (["kelas"] if kelas_col else [])
-
-    # Insert unik ke siswa_master
-    cur = conn.cursor()
-    for _, row in df_master.iterrows():
-        nis = str(row["nis"]).strip()
-        nama = str(row["nama"]).strip()
-        kelas = str(row["kelas"]).strip() if "kelas" in df_master.columns else "-"
-        try:
-            cur.execute(
-                "INSERT OR IGNORE INTO siswa_master (nis, nama, kelas) VALUES (?,?,?)",
-                (nis, nama, kelas)
-            )
-        except Exception:
-            pass
-    conn.commit()
-    conn.close()
+    pilih = [nis_col, nama_col] + ([kelas_col] if kelas_col else [])
+    # Hanya 2-3 kolom yang dibaca dari Parquet
+    df_dataset = dataset_store.load_dataset(columns=pilih)
+    if df_dataset is None or df_dataset.empty or not {nis_col, nama_col} <= set(df_dataset.columns):
+        return    # dataset diganti di antaranya (skema lain) → sync berikutnya
+    kelas_col = kelas_col if kelas_col in df_dataset.columns else None
+
+    # Data master baru dari dataset (NIS unik, baris pertama yang dipakai);
+    # NIS kosong dibuang dulu supaya tidak jadi kunci "nan"
+    df_dataset = df_dataset[df_dataset[nis_col].notna()]
+    def _teks(s, kosong):
+        return s.astype(object).where(s.notna(), kosong).astype(str).str.strip()
+    baru = pd.DataFrame({
+        "nis": dataset_store.norm_nis_series(df_dataset[nis_col]),
+        "nama": _teks(df_dataset[nama_col], ""),
+        "kelas": _teks(df_dataset[kelas_col], "-") if kelas_col else "-",
+    })
+    baru = baru[baru["nis"] != ""].drop_duplicates("nis", keep="first")
+
+    lama = pd.read_sql_query("SELECT id, nis, nama, kelas, sumber FROM siswa_master", conn)
+    gabung = baru.merge(lama, on="nis", how="outer", suffixes=("", "_lama"), indicator=True)
+
+    tambah = gabung[gabung["_merge"] == "left_only"]
+    sama = gabung[gabung["_merge"] == "both"]
+    ubah = sama[(sama["nama"] != sama["nama_lama"]) | (sama["kelas"] != sama["kelas_lama"])]
+    hapus = gabung[(gabung["_merge"] == "right_only") & (gabung["sumber"] == SUMBER_DATASET)]
+
+    with connection.transaction(DB_FILE) as conn:
+        conn.executemany(
+            "DELETE FROM siswa_master WHERE id=?",
+            [(int(i),) for i in hapus["id"]]
+        )
+        conn.executemany(
+            "UPDATE siswa_master SET nama=?, kelas=? WHERE id=?",
+            zip(ubah["nama"], ubah["kelas"], ubah["id"].astype(int).tolist())
+        )
+        conn.executemany(
+            "INSERT INTO siswa_master (nis, nama, kelas, sumber) VALUES (?,?,?,?)",
+            ((n, m, k, SUMBER_DATASET) for n, m, k in zip(tambah["nis"], tambah["nama"], tambah["kelas"]))
+        )
+    return {"tambah": len(tambah), "ubah": len(ubah), "hapus": len(hapus)}
 
 def add_siswa(nis, nama, kelas):
     if not nis or not nama:
         st.error("❌ NIS dan Nama wajib diisi!")
         return
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+    # transaction(): rollback saat error → koneksi bersama tidak tertinggal di transaksi terbuka
     try:
-        c.execute("INSERT INTO siswa_master (nis, nama, kelas) VALUES (?,?,?)", (nis, nama, kelas))
-        conn.commit()
+        with connection.transaction(DB_FILE) as conn:
+            conn.execute("INSERT INTO siswa_master (nis, nama, kelas) VALUES (?,?,?)", (nis, nama, kelas))
         st.success(f"✅ Siswa {nama} ({nis}) berhasil ditambahkan")
     except sqlite3.IntegrityError:
         st.error("❌ NIS sudah ada!")
-    conn.close()
 
 def update_siswa(id, nis, nama, kelas):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("UPDATE siswa_master SET nis=?, nama=?, kelas=? WHERE id=?", (nis, nama, kelas, id))
-    conn.commit()
-    conn.close()
-    st.success("✅ Data siswa berhasil diperbarui")
+    try:
+        with connection.transaction(DB_FILE) as conn:
+            conn.execute("UPDATE siswa_master SET nis=?, nama=?, kelas=? WHERE id=?", (nis, nama, kelas, id))
+        st.success("✅ Data siswa berhasil diperbarui")
+    except sqlite3.IntegrityError:
+        st.error("❌ NIS sudah dipakai siswa lain!")
 
 def delete_siswa(id):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("DELETE FROM siswa_master WHERE id=?", (id,))
-    conn.commit()
-    conn.close()
+    with connection.transaction(DB_FILE) as conn:
+        conn.execute("DELETE FROM siswa_master WHERE id=?", (id,))
     st.success("✅ Data siswa berhasil dihapus")
 
 # =========================
 # Halaman
 # =========================
+@profiling.timed("view.data_siswa")
 def show():
     st.title("📚 Manajemen Data Siswa")
     init_db()
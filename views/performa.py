@@ -0,0 +1,70 @@
+# views/performa.py
+# ==========================================================
+# Panel Performa (khusus Admin)
+# Ringkasan p50/p95 per tahap dari utils/profiling.py
+# ==========================================================
+import streamlit as st
+from utils import profiling, dtypes, jobs
+
+def _memori_dataset():
+    df = st.session_state.get("dataset")
+    if df is None:
+        return
+    rep = dtypes.memory_report(df)
+    with st.expander(f"💾 Memori dataset sesi: {dtypes.format_bytes(rep['Bytes'].iloc[-1])}"):
+        st.dataframe(rep, use_container_width=True, hide_index=True)
+
+def _daftar_job():
+    daftar = jobs.list_jobs()
+    if daftar.empty:
+        return
+    aktif = int(daftar["Status"].isin(jobs.AKTIF).sum())
+    with st.expander(f"🧵 Job latar belakang ({aktif} aktif)"):
+        st.dataframe(daftar, use_container_width=True, hide_index=True)
+        if aktif and st.button("⛔ Batalkan semua job aktif"):
+            for job_id in daftar.loc[daftar["Status"].isin(jobs.AKTIF), "ID"]:
+                jobs.cancel(job_id)
+            st.rerun()
+
+def show():
+    st.title("⏱️ Performa Aplikasi")
+
+    aktif = st.toggle("Aktifkan profiling", value=profiling.is_enabled())
+    if aktif != profiling.is_enabled():
+        profiling.set_enabled(aktif)
+    if not aktif:
+        st.info("Profiling nonaktif. Aktifkan lalu buka halaman lain untuk mengumpulkan sampel.")
+
+    _memori_dataset()
+    _daftar_job()
+
+    summary = profiling.summary()
+    if summary.empty:
+        st.caption("Belum ada sampel.")
+        return
+
+    st.subheader("📊 Ringkasan per Tahap (detik)")
+    st.dataframe(
+        summary.style.format({"p50": "{:.4f}", "p95": "{:.4f}", "Maks": "{:.4f}", "Total": "{:.3f}"}),
+        use_container_width=True, hide_index=True
+    )
+    st.bar_chart(summary.set_index("Tahap")[["p50", "p95"]])
+
+    with st.expander("🧾 Sampel terbaru"):
+        st.dataframe(profiling.samples().tail(200).iloc[::-1], use_container_width=True, hide_index=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button(
+            "📥 Download metrics.prom",
+            data=profiling.to_prometheus(),
+            file_name="metrics.prom",
+            mime="text/plain"
+        )
+    with col2:
+        if st.button("💾 Tulis ke data/metrics.prom"):
+            st.success(f"✅ Ditulis ke {profiling.write_prometheus()}")
+    with col3:
+        if st.button("🗑️ Reset sampel"):
+            profiling.clear()
+            st.rerun()
@@ -3,127 +3,204 @@
 # Modul Prediksi Kelulusan Siswa
 # Streamlit + Scikit-Learn + Altair + FPDF
 # ==========================================================
+import os
+import uuid
 import streamlit as st
 import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 import altair as alt
-from fpdf import FPDF
+from utils.training import bisa_cv, cross_validate, train_partitioned, kolom_partisi, ringkasan
+from utils.model_registry import get_registry, model_key
+from utils.pdf_cache import frame_key
+from utils.pdf_templates import new_pdf, to_bytes, render_surat, fixed_widths, FONT, NEXT
+from utils.pdf_table import render_table
+from utils.scoring import score_df, BATAS_ALPA
+from utils import profiling, helpers, chart_data, jobs, bulk_export, schema
+
+# Nama kanonik (utils/schema.py); kolom asli dataset dicari lewat skema kolom
+MAPEL_COLS = ["MTK", "BINDO", "BINGGRIS", "IPA", "IPS"]
+# Kolom lain yang dipakai halaman ini (scoring, tabel hasil, mode per partisi)
+KOLOM_PAKAI = ["NIS", "Nama", "EKSTRA", "Alpa", "Kelas", "Jurusan"]
+# Lebar tetap (mm) kolom tabel PDF; kolom lain berbagi sisa lebar halaman
+LEBAR_TETAP = (("nis", 20), ("nama", 60), ("keterangan", 60))
 
 
 # ===================== PDF GENERATOR =====================
 def generate_pdf(lulus, tidak_lulus, threshold, eval_df, kelas_name="Rapor"):
-    pdf = FPDF("P", "mm", "A4")
-    pdf.add_page()
-    pdf.set_font("Arial", "", 12)
+    pdf = new_pdf("P", 14, "B")
 
     # Header
-    pdf.set_font("Arial", "B", 14)
-    pdf.cell(0, 8, f"Prediksi Kelulusan - {kelas_name}", ln=1, align="C")
+    pdf.cell(0, 8, f"Prediksi Kelulusan - {kelas_name}", align="C", **NEXT)
     pdf.ln(4)
-    pdf.set_font("Arial", "", 12)
+    pdf.set_font(FONT, "", 12)
 
     # Threshold
-    pdf.cell(0, 8, f"Threshold Kelulusan: {threshold}", ln=1, align="L")
+    pdf.cell(0, 8, f"Threshold Kelulusan: {threshold}", **NEXT)
     pdf.ln(4)
 
     # Evaluasi Model
     if not eval_df.empty:
-        pdf.cell(0, 8, "Evaluasi Model", ln=1, align="L")
+        pdf.cell(0, 8, "Evaluasi Model", **NEXT)
         for _, row in eval_df.iterrows():
-            pdf.cell(0, 6, f"{row['Metrik']}: {row['Skor']:.2f}", ln=1, align="L")
+            std = f" +/- {row['Std']:.2f}" if "Std" in eval_df.columns else ""
+            pdf.cell(0, 6, f"{row['Metrik']}: {row['Skor']:.2f}{std}", **NEXT)
         pdf.ln(4)
 
     # Fungsi cetak tabel
     def print_table(df_table, title):
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 8, title, ln=1, align="C")
+        pdf.set_font(FONT, "B", 12)
+        pdf.cell(0, 8, title, align="C", **NEXT)
         pdf.ln(2)
-        pdf.set_font("Arial", "", 12)
+        pdf.set_font(FONT, "", 12)
 
         if not df_table.empty:
-            col_names = df_table.columns.tolist()
             page_width = pdf.w - 2 * pdf.l_margin
-            col_widths = []
-            for c in col_names:
-                if c.lower() == "nis":
-                    col_widths.append(20)
-                elif c.lower() == "nama":
-                    col_widths.append(60)
-                elif c.lower() == "keterangan":
-                    col_widths.append(60)
-                else:
-                    col_widths.append((page_width - 140) / (len(col_names) - 3))
-
-            # Header kolom
-            for i, h in enumerate(col_names):
-                pdf.cell(col_widths[i], 8, str(h), 1, 0, "C")
-            pdf.ln()
-
-            # Rows
-            for _, r in df_table.iterrows():
-                for i, c in enumerate(col_names):
-                    value = str(r[c])
-                    pdf.cell(col_widths[i], 8, value, 1, 0, "L")
-                pdf.ln()
+            col_widths = fixed_widths(tuple(df_table.columns), page_width, LEBAR_TETAP)
+            # Header diulang tiap halaman, pindah halaman dihitung di muka
+            render_table(pdf, df_table, col_widths, line_h=8, header_h=8, size=12, align="L")
         else:
-            pdf.cell(0, 8, "Tidak ada data", ln=1, align="L")
+            pdf.cell(0, 8, "Tidak ada data", **NEXT)
         pdf.ln(4)
 
     print_table(lulus, "Daftar Siswa Lulus")
     print_table(tidak_lulus, "Daftar Siswa Tidak Lulus")
 
-    pdf_bytes = bytes(pdf.output(dest="S"))
-    return pdf_bytes
+    return to_bytes(pdf)
 
 
 # PDF pribadi siswa
 def generate_pdf_siswa(nama, nis, rata2, bonus, status, threshold, alpa=None):
-    pdf = FPDF("P", "mm", "A4")
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(0, 10, "Hasil Prediksi Kelulusan", ln=1, align="C")
-    pdf.ln(8)
-
-    pdf.set_font("Arial", "", 12)
-    pdf.cell(0, 8, f"Nama : {nama}", ln=1)
-    pdf.cell(0, 8, f"NIS  : {nis}", ln=1)
-    pdf.cell(0, 8, f"Rata-rata + Bonus : {rata2:.2f}", ln=1)
-    pdf.cell(0, 8, f"Bonus Ekstra : {bonus}", ln=1)
-    pdf.cell(0, 8, f"Threshold    : {threshold}", ln=1)
-    if alpa is not None:
-        pdf.cell(0, 8, f"Alpa         : {alpa}", ln=1)
-    pdf.ln(4)
-
-    if status == 1:
-        pdf.set_text_color(0, 128, 0)
-        pdf.cell(0, 10, "Anda dinyatakan LULUS!", ln=1)
+    return render_surat(nama, nis, rata2, bonus, status, threshold, alpa)
+
+
+# ===================== TRAINING LATAR BELAKANG =====================
+@st.fragment(run_every=1.0)
+def _pantau_job(job_id):
+    """Polling status job (training / export) tanpa memblokir halaman; rerun penuh saat selesai."""
+    job = jobs.get(job_id)
+    if job is None or job.done:
+        st.rerun()
+    st.progress(job.fraction, text=f"⏳ {job.label}: {job.message or job.status}")
+    if st.button("⛔ Batalkan", key=f"batal_{job_id}"):
+        job.cancel()
+        st.rerun()
+
+
+def _sesi():
+    """Id sesi ini sebagai pemilik job (lihat jobs.release)."""
+    return st.session_state.setdefault("job_owner", uuid.uuid4().hex)
+
+
+def _model_latar(key, label, train_fn):
+    """Model dari registry; jika belum ada → dilatih sebagai job latar belakang.
+
+    Kembalikan (model, eval_df), atau None selama job masih berjalan / gagal.
+    """
+    hit = get_registry().get(key)
+    if hit is not None:
+        return hit
+
+    # Job lama sesi ini (key lain, mis. slider digeser) → lepas; dibatalkan
+    # hanya jika tidak ada sesi lain yang menunggu job yang sama
+    lama_id = st.session_state.get("prediksi_job")
+    lama = jobs.get(lama_id)
+    if lama is not None and lama.key != key:
+        jobs.release(lama_id, _sesi())
+
+    job = jobs.find(key)
+    # Gagal/dibatalkan yang belum pernah ditampilkan ke sesi ini (mis. dibatalkan saat
+    # slider digeser, lalu dikembalikan) → latih lagi; yang sudah tampil menunggu "Latih Ulang"
+    if job is None or (job.status in (jobs.GAGAL, jobs.DIBATALKAN) and job.id != lama_id):
+        def _latih(job):
+            model, eval_df = train_fn(lambda i, n: job.progress(i, n, f"{i}/{n} tugas selesai"))
+            get_registry().put(key, model, eval_df)
+            return model, eval_df
+        job = jobs.submit("train", _latih, key=key, label=label, owner=_sesi())
     else:
-        pdf.set_text_color(200, 0, 0)
-        pdf.cell(0, 10, "Anda dinyatakan TIDAK LULUS!", ln=1)
-        if alpa is not None and alpa > threshold:
-            pdf.set_text_color(200, 0, 0)
-            pdf.cell(0, 10, "Catatan: Alpa melebihi batas, hubungi Guru BK dan wali kelas.", ln=1)
-    pdf.set_text_color(0, 0, 0)
-
-    pdf_bytes = bytes(pdf.output(dest="S"))
-    return pdf_bytes
+        jobs.watch(job.id, _sesi())
+    st.session_state["prediksi_job"] = job.id
+
+    if job.status == jobs.SELESAI:
+        return job.result
+    if job.status == jobs.GAGAL:
+        st.error(f"❌ Training gagal: {job.error}")
+    elif job.status == jobs.DIBATALKAN:
+        st.warning("⚠️ Training dibatalkan.")
+    else:
+        st.info("🔄 Model sedang dilatih di latar belakang. Halaman lain tetap bisa dibuka.")
+        _pantau_job(job.id)
+        return None
+    if st.button("🔁 Latih Ulang", key=f"ulang_{job.id}"):
+        jobs.forget(job.id)
+        st.rerun()
+    return None
+
+
+def _export_massal(df, threshold):
+    """Surat hasil tiap siswa + rapor per kelas → ZIP (job latar belakang, render paralel)."""
+    st.markdown("---")
+    st.subheader("📦 Export Massal (ZIP)")
+    st.caption("Surat hasil prediksi tiap siswa + rapor per kelas dalam satu file ZIP beserta manifest.csv.")
+
+    if st.button("📦 Buat ZIP Semua Dokumen"):
+        hasil = df[[c for c in bulk_export.SURAT_COLS + ["Kelas"] if c in df.columns]]
+        rapor_df = helpers.rapor_frame()[0]
+        key = f"export|{frame_key(hasil, threshold)}|{None if rapor_df is None else frame_key(rapor_df)}"
+        job = jobs.submit(
+            "pdf_bulk",
+            lambda job: bulk_export.export_zip(
+                hasil, threshold, rapor_df,
+                progress=lambda i, n: job.progress(i, n, f"{i}/{n} tugas render selesai")
+            ),
+            key=key, label=f"Export {len(hasil)} surat + rapor per kelas"
+        )
+        st.session_state["prediksi_export"] = job.id
+
+    job = jobs.get(st.session_state.get("prediksi_export"))
+    if job is None:
+        return
+    if not job.done:
+        _pantau_job(job.id)
+    elif job.status == jobs.GAGAL:
+        st.error(f"❌ Export gagal: {job.error}")
+    elif job.status == jobs.DIBATALKAN:
+        st.warning("⚠️ Export dibatalkan.")
+    else:
+        path, manifest = job.result
+        if not os.path.exists(path):
+            # ZIP lama sudah dibersihkan → buat ulang
+            jobs.forget(job.id)
+            st.session_state.pop("prediksi_export", None)
+            st.warning("⚠️ File export sudah tidak ada, silakan buat ulang.")
+            return
+        gagal = int((manifest["Status"] != "OK").sum())
+        st.success(f"✅ {len(manifest) - gagal} dokumen siap" + (f", {gagal} gagal" if gagal else ""))
+        with open(path, "rb") as f:
+            st.download_button("📥 Download ZIP", data=f, file_name=os.path.basename(path), mime="application/zip")
+        with st.expander("🧾 Manifest"):
+            st.dataframe(manifest, use_container_width=True, hide_index=True)
 
 
 # ===================== SHOW FUNCTION =====================
+@profiling.timed("view.prediksi")
 def show(dataset=None, role="admin", nis=None, nama=None):
     st.title("🎯 Prediksi Kelulusan Siswa")
 
     # Dataset
-    if dataset is None:
-        if "dataset" not in st.session_state:
-            st.error("❌ Dataset belum diupload.")
-            return
-        df = st.session_state["dataset"].copy()
-    else:
-        df = dataset.copy()
+    with profiling.stage("prediksi.load"):
+        if dataset is None:
+            roles = helpers.dataset_roles()
+            if roles is None:
+                st.error("❌ Dataset belum diupload.")
+                return
+            # Proyeksi: mapel + kolom identitas/scoring saja
+            df = helpers.load_view_dataset(
+                [c for c in map(roles.col, MAPEL_COLS) if c is not None] + list(roles.rename_map(KOLOM_PAKAI))
+            )
+        else:
+            df = dataset.copy()
+            roles = schema.resolve_df(df)
+        # Kolom identitas/scoring dengan nama lain (mis. "Nama Siswa", "ALPA") → nama kanonik
+        df = df.rename(columns=roles.rename_map(KOLOM_PAKAI))
 
     # Filter untuk siswa
     if role == "siswa":
@@ -139,29 +216,12 @@ def show(dataset=None, role="admin", nis=None, nama=None):
             st.success(f"✅ Selamat datang, {df.iloc[0]['Nama']}")
 
     # ===================== Pilih kolom mapel =====================
-    mapel_cols = ["MTK", "BINDO", "BINGGRIS", "IPA", "IPS"]
-    nilai_cols = [c for c in mapel_cols if c in df.columns]
+    nilai_cols = [c for c in map(roles.col, MAPEL_COLS) if c in df.columns]
 
     if not nilai_cols:
         st.error("❌ Dataset tidak memiliki kolom mapel yang valid.")
         return
 
-    # Hitung rata-rata mapel
-    df["Rata-rata"] = df[nilai_cols].mean(axis=1)
-
-    # Bonus ekstra (B=60, SB=65)
-    def bonus_ekstra(row):
-        if "EKSTRA" not in row:
-            return 0
-        if str(row["EKSTRA"]).upper() == "B":
-            return 60
-        elif str(row["EKSTRA"]).upper() == "SB":
-            return 65
-        return 0
-
-    df["Bonus_Ekstra"] = df.apply(bonus_ekstra, axis=1)
-    df["Rata-rata_Final"] = df["Rata-rata"] + df["Bonus_Ekstra"]
-
     # Threshold slider (Admin bisa atur, siswa hanya lihat default)
     if role == "admin":
         threshold = st.slider("🎚️ Threshold Kelulusan", 0, 200, 75)
@@ -169,48 +229,71 @@ def show(dataset=None, role="admin", nis=None, nama=None):
         threshold = 75
         st.info(f"🎚️ Threshold Kelulusan: {threshold}")
 
-    df["Target"] = np.where(df["Rata-rata_Final"] >= threshold, 1, 0)
-    df["Keterangan"] = ""
-
     # ==========================================================
-    # Override jika alpa > 5 → beri keterangan & set Target = 0
+    # Rata-rata + bonus ekstra (B=60, SB=65) → Target;
+    # Alpa > 5 → Target = 0 + keterangan (lihat utils/scoring.py)
     # ==========================================================
-    if "Alpa" in df.columns:
-        df.loc[df["Alpa"] > 5, "Target"] = 0
-        df.loc[df["Alpa"] > 5, "Keterangan"] = "Hubungi guru BK dan wali kelas"
+    with profiling.stage("prediksi.features"):
+        # Dataset utuh (admin) → rata-rata mapel diambil dari data turunan per versi
+        rata = None
+        if dataset is None and role != "siswa":
+            data = helpers.derived_data()
+            rata = data.rata_rata(nilai_cols) if data is not None else None
+            if rata is not None and len(rata) != len(df):
+                rata = None
+        df = score_df(df, nilai_cols, threshold, rata=rata)
 
     # ================= Model Random Forest =================
     X = df[nilai_cols]
     y = df["Target"]
 
     eval_df = pd.DataFrame()
-    if len(y.unique()) > 1 and role == "admin":
-        min_count = y.value_counts().min()
-        if min_count >= 2:
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.3, random_state=42, stratify=y
+    if role == "admin" and bisa_cv(y):
+        # Mode model: 1 model global, atau 1 model per Kelas / Jurusan (paralel)
+        partisi = kolom_partisi(df.columns)
+        mode = st.radio("🧩 Mode Model", ["Global"] + [f"Per {p}" for p in partisi], horizontal=True)
+
+        # Model diambil dari registry → rerun (slider, input, tombol) tidak melatih ulang;
+        # belum ada → dilatih sebagai job latar belakang (halaman tidak membeku)
+        with profiling.stage("prediksi.train"):
+            if mode == "Global":
+                # K-fold CV (fold paralel); key = isi dataset → otomatis baru saat dataset berubah
+                key = model_key(X, y, f"{threshold}|cv")
+                hasil = _model_latar(key, "Training model global (CV)",
+                                     lambda progress: cross_validate(X, y, progress=progress))
+                if hasil is not None:
+                    model, eval_df = hasil
+            else:
+                groups = df[partisi[mode.removeprefix("Per ")]]
+                key = model_key(X.assign(_partisi=groups.astype(str)), y, f"{threshold}|{mode}")
+                hasil = _model_latar(key, f"Training model {mode.lower()}",
+                                     lambda progress: train_partitioned(X, y, groups, progress=progress))
+                if hasil is not None:
+                    models, eval_partisi = hasil
+                    eval_df = ringkasan(eval_partisi)
+
+        if mode != "Global" and hasil is not None:
+            st.subheader(f"🧩 Evaluasi {mode} ({len(models)} model)")
+            st.dataframe(
+                eval_partisi.style.format({m: "{:.2f}" for m in ["Accuracy", "Precision", "Recall", "F1-Score"]}, na_rep="-"),
+                use_container_width=True, hide_index=True
             )
-            model = RandomForestClassifier(random_state=42)
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-
-            eval_df = pd.DataFrame({
-                "Metrik": ["Accuracy", "Precision", "Recall", "F1-Score"],
-                "Skor": [
-                    accuracy_score(y_test, y_pred),
-                    precision_score(y_test, y_pred, zero_division=0),
-                    recall_score(y_test, y_pred, zero_division=0),
-                    f1_score(y_test, y_pred, zero_division=0)
-                ]
-            })
-
+        if not eval_df.empty:
             st.subheader("📊 Evaluasi Model (Random Forest)")
+            if "Std" in eval_df.columns:
+                st.caption(f"Rata-rata ± std dari {int(eval_df['Fold'].iloc[0])}-fold cross-validation")
             st.dataframe(eval_df, use_container_width=True)
-            chart_eval = alt.Chart(eval_df).mark_line(color="red", point=True).encode(
-                alt.X("Metrik", title="Metrik"),
-                alt.Y("Skor", title="Skor")
-            ).properties(width=600, height=300, title="Evaluasi Model - Random Forest")
-            st.altair_chart(chart_eval, use_container_width=True)
+            with profiling.stage("prediksi.chart"):
+                chart_eval = alt.Chart(eval_df).mark_line(color="red", point=True).encode(
+                    alt.X("Metrik", title="Metrik"),
+                    alt.Y("Skor", title="Skor")
+                ).properties(width=600, height=300, title="Evaluasi Model - Random Forest")
+                if "Std" in eval_df.columns:
+                    # Error bar ± std antar fold
+                    chart_eval += alt.Chart(eval_df).mark_errorbar(color="red").encode(
+                        alt.X("Metrik"), alt.Y("Skor"), alt.YError("Std")
+                    )
+                st.altair_chart(chart_eval, use_container_width=True)
 
     # ================= Hasil Prediksi =================
     st.subheader("📋 Hasil Prediksi Kelulusan")
@@ -220,26 +303,29 @@ def show(dataset=None, role="admin", nis=None, nama=None):
     tidak_lulus = df[df["Target"] == 0][selected_cols]
 
     if role == "admin":
-        # Ringkasan jumlah
-        summary_df = pd.DataFrame({
-            "Status": ["Lulus", "Tidak Lulus"],
-            "Jumlah": [len(lulus), len(tidak_lulus)]
-        })
-
-        # Grafik jumlah kelulusan
-        chart_summary = alt.Chart(summary_df).mark_bar().encode(
-            alt.X("Status", title="Status"),
-            alt.Y("Jumlah", title="Jumlah"),
-            color=alt.Color("Status", scale=alt.Scale(range=["green", "red"]))
-        ).properties(width=400, height=300, title="Distribusi Kelulusan")
-        st.altair_chart(chart_summary, use_container_width=True)
-
-        # Grafik distribusi nilai
-        chart_nilai = alt.Chart(df).mark_bar(color="blue").encode(
-            alt.X("Rata-rata_Final", bin=alt.Bin(maxbins=20), title="Rata-rata Final"),
-            alt.Y("count()", title="Jumlah")
-        ).properties(width=600, height=300, title="Distribusi Nilai Rata-rata Final")
-        st.altair_chart(chart_nilai, use_container_width=True)
+        with profiling.stage("prediksi.chart"):
+            # Ringkasan jumlah
+            summary_df = pd.DataFrame({
+                "Status": ["Lulus", "Tidak Lulus"],
+                "Jumlah": [len(lulus), len(tidak_lulus)]
+            })
+
+            # Grafik jumlah kelulusan
+            chart_summary = alt.Chart(summary_df).mark_bar().encode(
+                alt.X("Status", title="Status"),
+                alt.Y("Jumlah", title="Jumlah"),
+                color=alt.Color("Status", scale=alt.Scale(range=["green", "red"]))
+            ).properties(width=400, height=300, title="Distribusi Kelulusan")
+            st.altair_chart(chart_summary, use_container_width=True)
+
+            # Grafik distribusi nilai
+            # Histogram diagregasi di server (bukan seluruh baris siswa)
+            chart_nilai = alt.Chart(chart_data.histogram(df["Rata-rata_Final"], maxbins=20)).mark_bar(color="blue").encode(
+                alt.X("Mulai:Q", bin="binned", title="Rata-rata Final"),
+                alt.X2("Akhir:Q"),
+                alt.Y("Jumlah:Q", title="Jumlah")
+            ).properties(width=600, height=300, title="Distribusi Nilai Rata-rata Final")
+            st.altair_chart(chart_nilai, use_container_width=True)
 
     # Tabel hasil
     if role == "admin":
@@ -254,15 +340,16 @@ def show(dataset=None, role="admin", nis=None, nama=None):
             st.success("🎉 Anda dinyatakan LULUS!")
         else:
             st.error("❌ Anda dinyatakan TIDAK LULUS!")
-            if "Alpa" in row and row["Alpa"] > 5:
+            if "Alpa" in row and row["Alpa"] > BATAS_ALPA:
                 st.warning("⚠️ Karena Alpa melebihi batas, harap menemui Guru BK dan wali kelas.")
 
         # Download PDF pribadi
         if st.button("📥 Download Hasil Prediksi Saya (PDF)"):
-            pdf_bytes = generate_pdf_siswa(
-                row["Nama"], row["NIS"], row["Rata-rata"],
-                row["Bonus_Ekstra"], row["Target"], threshold, row.get("Alpa", None)
-            )
+            with profiling.stage("prediksi.pdf_siswa"):
+                pdf_bytes = generate_pdf_siswa(
+                    row["Nama"], row["NIS"], row["Rata-rata"],
+                    row["Bonus_Ekstra"], row["Target"], threshold, row.get("Alpa", None)
+                )
             st.download_button(
                 label="Download PDF",
                 data=pdf_bytes,
@@ -274,10 +361,12 @@ def show(dataset=None, role="admin", nis=None, nama=None):
     if role == "admin":
         kelas_name = st.text_input("Nama Kelas / File", "Kelas")
         if st.button("📥 Download PDF Hasil Prediksi (Semua Siswa)"):
-            pdf_bytes = generate_pdf(lulus, tidak_lulus, threshold, eval_df, kelas_name)
+            with profiling.stage("prediksi.pdf"):
+                pdf_bytes = generate_pdf(lulus, tidak_lulus, threshold, eval_df, kelas_name)
             st.download_button(
                 label="Download PDF",
                 data=pdf_bytes,
                 file_name=f"{kelas_name}_Prediksi.pdf",
                 mime="application/pdf"
             )
+        _export_massal(df, threshold)
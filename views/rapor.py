@@ -1,113 +1,65 @@
 import streamlit as st
 import pandas as pd
 from io import BytesIO
-from fpdf import FPDF
 import os
+from utils.pdf_cache import PdfCache, frame_key
+from utils.pdf_templates import new_pdf, to_bytes, text_lengths, proportional_widths, NEXT
+from utils.pdf_table import render_table
+from utils import profiling, dtypes, helpers
 
 # ===========================
 # Fungsi generate PDF
 # ===========================
 def generate_pdf(dataframe, filename="rapor_siswa.pdf"):
-    pdf = FPDF(orientation="L", unit="mm", format="A4")
-    pdf.add_page()
+    pdf = new_pdf("L", 14, "B")
     pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.set_font("Arial", "B", 14)
 
     # Judul ambil dari nama file
     kelas = os.path.splitext(os.path.basename(filename))[0]
-    pdf.cell(0, 10, f"RAPOR SISWA - {kelas}", 0, 1, "C")
+    pdf.cell(0, 10, f"RAPOR SISWA - {kelas}", align="C", **NEXT)
     pdf.ln(5)
-    pdf.set_font("Arial", "", 9)
-
-    headers = list(dataframe.columns)
-    n_cols = len(headers)
 
     # Total lebar halaman A4 landscape = 297mm, margin kiri-kanan 15mm → 267mm untuk tabel
     total_width = 267
 
-    # Hitung lebar kolom proporsional sesuai panjang teks
-    text_lengths = [max([len(str(x)) for x in dataframe[h]] + [len(h)]) for h in headers]
-    sum_len = sum(text_lengths)
-    col_widths = [max(20, min(total_width * l / sum_len, 50)) for l in text_lengths]
-
-    # Header tabel
-    pdf.set_font("Arial", "B", 9)
-    for i, h in enumerate(headers):
-        pdf.cell(col_widths[i], 8, str(h), 1, 0, "C")
-    pdf.ln()
-
-    # Isi tabel
-    pdf.set_font("Arial", "", 8)
-    for _, row in dataframe.iterrows():
-        max_lines = 1
-        cell_texts = []
-        for i, h in enumerate(headers):
-            text = str(row[h])
-            # hitung baris multi-cell jika teks panjang
-            lines = pdf.multi_cell(col_widths[i], 6, text, border=0, split_only=True)
-            max_lines = max(max_lines, len(lines))
-            cell_texts.append(text)
-
-        # tulis row
-        for line_idx in range(max_lines):
-            for i, text in enumerate(cell_texts):
-                pdf.multi_cell(
-                    col_widths[i],
-                    6,
-                    text if line_idx == 0 else "",
-                    border=1,
-                    align="C",
-                    ln=3 if i == n_cols - 1 else 0
-                )
-            pdf.ln()
+    # Lebar kolom proporsional panjang teks (str.len() per kolom, bukan per sel)
+    col_widths = proportional_widths(text_lengths(dataframe), total_width)
+
+    # Tabel: header diulang tiap halaman, sel panjang dipecah beberapa baris
+    render_table(pdf, dataframe, col_widths, line_h=6, header_h=8, size=8, header_size=9, align="C")
 
     # Output PDF ke BytesIO
-    pdf_bytes = pdf.output(dest="S")
-    pdf_output = BytesIO(pdf_bytes)
-    return pdf_output
+    return BytesIO(to_bytes(pdf))
+
+# Cache PDF per isi tabel + judul (dipakai bersama semua sesi)
+_pdf_cache = PdfCache()
+
+def get_pdf_bytes(dataframe, filename="rapor_siswa.pdf"):
+    """PDF rapor dari cache; dibangun hanya jika isi tabel / judul berubah."""
+    key = frame_key(dataframe, "rapor", filename)
+    def build():
+        with profiling.stage("rapor.pdf"):
+            return generate_pdf(dataframe, filename).getvalue()
+    return _pdf_cache.get_or_build(key, build)
 
 # ===========================
 # Main view
 # ===========================
+@profiling.timed("view.rapor")
 def show():
     st.title("📑 Rapor Siswa")
 
-    if "dataset" not in st.session_state or st.session_state["dataset"] is None:
+    # Identitas + mapel + rata-rata (kolom mapel dari data turunan per versi dataset)
+    display_df, nama_asli = helpers.rapor_frame()
+    if display_df is None:
         st.warning("⚠️ Upload dataset dulu di sidebar untuk menampilkan rapor.")
         return
-
-    df = st.session_state["dataset"].copy()
-
-    # Hapus duplikat kolom
-    df = df.loc[:, ~df.columns.duplicated()]
-
-    # Tentukan kolom nilai mapel (tanpa kolom identitas/absensi)
-    exclude_cols = ["no", "nis", "nisn", "sakit", "izin", "alpa"]
-    nilai_cols = [
-        c for c in df.select_dtypes(include="number").columns
-        if c.lower() not in exclude_cols
-    ]
-
-    # Tambah rata-rata hanya dari mapel
-    if "Rata-rata" not in df.columns and nilai_cols:
-        df["Rata-rata"] = df[nilai_cols].mean(axis=1)
-
-    # Tentukan kolom untuk ditampilkan
-    display_cols = []
-    for col in ["NIS", "NISN", "Nama", "Kelas"]:
-        if col in df.columns:
-            display_cols.append(col)
-    display_cols += nilai_cols
-    if "Rata-rata" in df.columns:
-        display_cols.append("Rata-rata")
-
-    if not display_cols:
+    if display_df.columns.empty:
         st.warning("⚠️ Tidak ada kolom yang bisa ditampilkan.")
         return
 
-    # Buat DataFrame baru & hapus kolom duplikat biar rapi
-    display_df = df.loc[:, display_cols].copy()
-    display_df = display_df.loc[:, ~display_df.columns.duplicated()]
+    # Dataset dipadatkan (uint8/category) → lebarkan hanya untuk editor
+    display_df = dtypes.widen_for_edit(display_df)
 
     # Tampilkan tabel editable
     st.subheader("📋 Tabel Rapor Siswa")
@@ -115,7 +67,14 @@ def show():
 
     # Tombol simpan perubahan
     if st.button("💾 Simpan Perubahan"):
-        st.session_state["dataset"][display_df.columns] = edited_df
+        # Frame sesi = salinan dangkal frame bersama → assign membuat frame baru
+        # (tidak menulis ke kolom bersama, dengan atau tanpa copy-on-write);
+        # kolom identitas bernama kanonik ditulis balik ke kolom aslinya
+        simpan = edited_df.rename(columns=nama_asli)
+        st.session_state["dataset"] = st.session_state["dataset"].assign(
+            **{c: simpan[c] for c in simpan.columns}
+        )
+        st.session_state.pop("dataset_version", None)   # sesi kini berbeda dari dataset tersimpan
         st.success("✅ Perubahan disimpan.")
 
     st.markdown("---")
@@ -123,11 +82,17 @@ def show():
 
     # Nama file sesuai kelas
     filename = st.session_state.get("dataset_filename", "rapor_siswa.csv")
-    pdf_data = generate_pdf(edited_df, filename)
-
-    st.download_button(
-        label="📥 Download PDF",
-        data=pdf_data,
-        file_name=f"Rapor_{os.path.splitext(os.path.basename(filename))[0]}.pdf",
-        mime="application/pdf"
-    )
+
+    # PDF hanya dibuat saat diminta; isi yang sama diambil dari cache
+    key = frame_key(edited_df, "rapor", filename)
+    if st.button("🧾 Buat PDF Rapor"):
+        get_pdf_bytes(edited_df, filename)
+    pdf_data = _pdf_cache.get(key)
+
+    if pdf_data is not None:
+        st.download_button(
+            label="📥 Download PDF",
+            data=pdf_data,
+            file_name=f"Rapor_{os.path.splitext(os.path.basename(filename))[0]}.pdf",
+            mime="application/pdf"
+        )
@@ -2,17 +2,18 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
+from utils import profiling, helpers, chart_data
 
+@profiling.timed("view.statistik")
 def show():
     st.sidebar.title("📂 Statistik")
 
-    if "dataset" not in st.session_state or st.session_state["dataset"] is None:
+    # Kolom mapel sudah di-resolve sekali per versi dataset
+    data = helpers.derived_data()
+    if data is None:
         st.warning("⚠️ Upload dataset dulu.")
         return
-
-    df = st.session_state["dataset"].copy()
-    exclude_cols = ["no","nis","nisn","sakit","izin","alpa","Nama","Kelas","Jurusan"]
-    nilai_cols = [c for c in df.select_dtypes(include="number").columns if c.lower() not in exclude_cols]
+    nilai_cols = data.nilai_cols
 
     if not nilai_cols:
         st.info("Tidak ada kolom nilai numerik.")
@@ -24,20 +25,23 @@ def show():
     # Dropdown mata pelajaran
     mapel = st.selectbox("Pilih Mata Pelajaran", nilai_cols)
 
-    nilai_mapel = df[[mapel]].rename(columns={mapel: "Nilai"})
+    # Hanya 1 kolom yang dibaca; bin & KDE dihitung di server
+    nilai = helpers.load_view_dataset([mapel])[mapel]
+    hist_df = chart_data.histogram(nilai, maxbins=30)
 
     # Histogram
-    hist = alt.Chart(nilai_mapel).mark_bar(color="crimson", opacity=0.6).encode(
-        x=alt.X("Nilai:Q", bin=alt.Bin(maxbins=30), title="Nilai"),
-        y=alt.Y("count()", title="Frekuensi"),
+    hist = alt.Chart(hist_df).mark_bar(color="crimson", opacity=0.6).encode(
+        x=alt.X("Mulai:Q", bin="binned", title="Nilai"),
+        x2="Akhir:Q",
+        y=alt.Y("Jumlah:Q", title="Frekuensi"),
     )
 
-    # Density line
-    density = alt.Chart(nilai_mapel).transform_density(
-        "Nilai", as_=["Nilai", "density"]
-    ).mark_line(color="black").encode(
+    # Density line (diskalakan ke frekuensi supaya sejajar dengan histogram)
+    lebar_bin = float(hist_df["Akhir"].iloc[0] - hist_df["Mulai"].iloc[0]) if len(hist_df) else 1.0
+    density_df = chart_data.kde(nilai, points=100, scale_to=(int(nilai.notna().sum()), lebar_bin))
+    density = alt.Chart(density_df).mark_line(color="black").encode(
         x="Nilai:Q",
-        y="density:Q",
+        y="Densitas:Q",
     )
 
     # Tambahkan nama mata pelajaran pada judul